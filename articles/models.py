@@ -0,0 +1,19 @@
+"""Models for precomputed articles."""
+from mongoengine import Document
+from mongoengine.fields import DictField, ListField, StringField
+
+
+class Article(Document):
+    """All dict entries and concepts that can be looked up from a lemma.
+
+    The entries and concepts are stored as raw documents with their lemmas
+    inlined, so that an article is served without further queries.
+    """
+
+    meta = {
+        "collection": "articles",
+        "indexes": [{"fields": ["lemma"], "unique": True}],
+    }
+    lemma = StringField(required=True)
+    dictEntries = ListField(DictField())
+    concepts = ListField(DictField())
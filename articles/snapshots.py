@@ -0,0 +1,187 @@
+"""Make and restore the dict entry and concept snapshots of articles."""
+import logging
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+
+from backend.cache import dataset_version
+from dicts.models import DictEntry
+from lemmas.models import Lemma
+from terms.models import Concept
+
+from .models import Article
+
+LOGGER = logging.getLogger(__name__)
+
+
+def inline_lemmas(pks, lemmas, owner):
+    """Get the raw lemmas of pks, skipping and logging dangling references."""
+    inlined = []
+    for pk in pks:
+        if pk in lemmas:
+            inlined.append(lemmas[pk])
+        else:
+            LOGGER.warning(f"{owner} refers to the missing lemma {pk}")
+
+    return inlined
+
+
+def inline_dict_entry_lemmas(dict_entry, lemmas):
+    """Replace the lemma ids of a raw dict entry with the raw lemmas.
+
+    Args:
+        dict_entry: a dict entry as stored in mongodb
+        lemmas: raw lemmas by id
+
+    Returns:
+        dict: a copy of dict_entry with its lemmas inlined, lemmas
+            missing from lemmas are left out
+    """
+    owner = f"Dict entry {dict_entry.get('_id')}"
+    return {
+        **dict_entry,
+        "lookupLemmas": inline_lemmas(
+            dict_entry.get("lookupLemmas", []), lemmas, owner
+        ),
+        "translationGroups": [
+            {
+                **translation_group,
+                "translationLemmas": inline_lemmas(
+                    translation_group.get("translationLemmas", []), lemmas, owner
+                ),
+            }
+            for translation_group in dict_entry.get("translationGroups", [])
+        ],
+    }
+
+
+def inline_concept_lemmas(concept, lemmas):
+    """Replace the expression ids of the terms of a raw concept with the lemmas.
+
+    Terms whose expression is missing from lemmas are left out.
+    """
+    terms = []
+    for term in concept.get("terms", []):
+        if term.get("expression") in lemmas:
+            terms.append({**term, "expression": lemmas[term["expression"]]})
+        else:
+            LOGGER.warning(
+                f"Concept {concept.get('_id')} refers to the missing lemma "
+                f"{term.get('expression')}"
+            )
+
+    return {**concept, "terms": terms}
+
+
+def restore_lemmas(lemmas):
+    return [Lemma._from_son(lemma) for lemma in lemmas]
+
+
+def restore_dict_entry(snapshot):
+    """Make a DictEntry, with loaded lemmas, from its snapshot."""
+    return DictEntry._from_son(
+        {
+            **snapshot,
+            "lookupLemmas": restore_lemmas(snapshot["lookupLemmas"]),
+            "translationGroups": [
+                {
+                    **translation_group,
+                    "translationLemmas": restore_lemmas(
+                        translation_group["translationLemmas"]
+                    ),
+                }
+                for translation_group in snapshot["translationGroups"]
+            ],
+        }
+    )
+
+
+def restore_concept(snapshot):
+    """Make a Concept, with loaded term expressions, from its snapshot."""
+    return Concept._from_son(
+        {
+            **snapshot,
+            "terms": [
+                {**term, "expression": Lemma._from_son(term["expression"])}
+                for term in snapshot["terms"]
+            ],
+        }
+    )
+
+
+def make_articles(dict_entries, concepts, lemmas):
+    """Group the dict entries and concepts by the lemmas they are found by.
+
+    A dict entry is found by its lookup lemma strings and its translation
+    lemma strings, a concept is found by the expressions of all its
+    language versions.
+
+    Args:
+        dict_entries: raw dict entries
+        concepts: raw concepts
+        lemmas: raw lemmas by id
+
+    Returns:
+        list: Articles, sorted by lemma
+    """
+    articles = defaultdict(lambda: {"dictEntries": [], "concepts": []})
+    for dict_entry in dict_entries:
+        snapshot = inline_dict_entry_lemmas(dict_entry, lemmas)
+        for lemma in set(
+            dict_entry.get("lookupLemmaStrings", [])
+            + dict_entry.get("translationLemmaStrings", [])
+        ):
+            articles[lemma]["dictEntries"].append(snapshot)
+
+    language_versions = defaultdict(list)
+    for concept in concepts:
+        language_versions[concept["name"]].append(concept)
+
+    for name in sorted(language_versions):
+        snapshots = [
+            inline_concept_lemmas(concept, lemmas)
+            for concept in language_versions[name]
+        ]
+        for lemma in {
+            expression
+            for concept in language_versions[name]
+            for expression in concept.get("expressions", [])
+        }:
+            articles[lemma]["concepts"].extend(snapshots)
+
+    return [Article(lemma=lemma, **articles[lemma]) for lemma in sorted(articles)]
+
+
+@lru_cache(maxsize=1)
+def has_articles(version):
+    """Check if make_articles has been run for a dataset version."""
+    return Article.objects.limit(1).count(with_limit_and_skip=True) > 0
+
+
+def serves_articles():
+    """Check if articles are turned on, and made for the current dataset."""
+    return settings.ARTICLE_SNAPSHOTS and has_articles(dataset_version())
+
+
+def get_articles(info, lemmas):
+    """Get the articles of lemmas, memoised for the rest of the request.
+
+    dictEntryList and conceptList are asked for in the same request, so
+    each article is only read once.
+
+    Returns:
+        dict: Articles by lemma, empty articles for lemmas finding nothing
+    """
+    articles = getattr(info.context, "articles", {})
+    unread = [lemma for lemma in set(lemmas) if lemma not in articles]
+    if unread:
+        for lemma in unread:
+            articles[lemma] = Article(lemma=lemma)
+        for article in Article.objects(lemma__in=unread):
+            articles[article.lemma] = article
+
+    if info.context is not None:
+        info.context.articles = articles
+
+    return {lemma: articles[lemma] for lemma in lemmas}
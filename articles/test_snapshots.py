@@ -0,0 +1,111 @@
+import unittest
+
+from bson import ObjectId
+
+from articles.snapshots import make_articles, restore_concept, restore_dict_entry
+from dicts.models import DictEntry, TranslationGroup
+from lemmas.models import Lemma
+from terms.models import Concept, Term
+
+
+def make_lemma(lemma, language):
+    return Lemma(
+        pk=ObjectId(), lemma=lemma, presentation_lemma=lemma, language=language
+    )
+
+
+class TestSnapshots(unittest.TestCase):
+    def setUp(self):
+        self.guolli = make_lemma("guolli", "sme")
+        self.kala = make_lemma("kala", "fin")
+        self.fisk = make_lemma("fisk", "nob")
+        self.lemmas = {
+            lemma.pk: lemma.to_mongo().to_dict()
+            for lemma in (self.guolli, self.kala, self.fisk)
+        }
+        self.dict_entry = DictEntry(
+            pk=ObjectId(),
+            dictName="sammallahtismefin",
+            srcLang="sme",
+            targetLang="fin",
+            lookupLemmas=[self.guolli],
+            translationGroups=[TranslationGroup(translationLemmas=[self.kala])],
+            lookupLemmaStrings=["guolli"],
+            translationLemmaStrings=["kala"],
+        )
+        self.concepts = [
+            Concept(
+                pk=ObjectId(),
+                name="Boazodoallu:guolli",
+                language=language,
+                terms=[Term(expression=lemma)],
+                expressions=[lemma.lemma],
+                expressionLanguage=lemma.language,
+            )
+            for language, lemma in (("se", self.guolli), ("nb", self.fisk))
+        ]
+        self.articles = {
+            article.lemma: article
+            for article in make_articles(
+                [self.dict_entry.to_mongo().to_dict()],
+                [concept.to_mongo().to_dict() for concept in self.concepts],
+                self.lemmas,
+            )
+        }
+
+    def test_articles_are_made_for_all_lookup_strings(self):
+        self.assertEqual(list(self.articles), ["fisk", "guolli", "kala"])
+        self.assertEqual(len(self.articles["kala"].dictEntries), 1)
+        self.assertEqual(self.articles["kala"].concepts, [])
+
+    def test_all_language_versions_are_in_the_article(self):
+        self.assertEqual(len(self.articles["fisk"].concepts), 2)
+        self.assertEqual(self.articles["fisk"].dictEntries, [])
+
+    def test_dict_entry_is_restored_with_lemmas(self):
+        dict_entry = restore_dict_entry(self.articles["guolli"].dictEntries[0])
+
+        self.assertEqual(dict_entry.pk, self.dict_entry.pk)
+        self.assertEqual(dict_entry.translationLemmaStrings, ["kala"])
+        (lookup_lemma,) = dict_entry._data["lookupLemmas"]
+        self.assertIsInstance(lookup_lemma, Lemma)
+        self.assertEqual(lookup_lemma.lemma, "guolli")
+        (translation_lemma,) = dict_entry.translationGroups[0]._data[
+            "translationLemmas"
+        ]
+        self.assertEqual(translation_lemma.pk, self.kala.pk)
+
+    def test_concept_is_restored_with_expressions(self):
+        concepts = [
+            restore_concept(snapshot) for snapshot in self.articles["guolli"].concepts
+        ]
+
+        self.assertEqual(
+            [concept.expressionLanguage for concept in concepts], ["sme", "nob"]
+        )
+        expression = concepts[1].terms[0]._data["expression"]
+        self.assertIsInstance(expression, Lemma)
+        self.assertEqual(expression.lemma, "fisk")
+
+    def test_missing_lemmas_are_left_out(self):
+        lemmas = {self.guolli.pk: self.lemmas[self.guolli.pk]}
+        with self.assertLogs("articles.snapshots", level="WARNING"):
+            articles = {
+                article.lemma: article
+                for article in make_articles(
+                    [self.dict_entry.to_mongo().to_dict()],
+                    [concept.to_mongo().to_dict() for concept in self.concepts],
+                    lemmas,
+                )
+            }
+
+        dict_entry = restore_dict_entry(articles["kala"].dictEntries[0])
+        self.assertEqual(dict_entry.lookupLemmas, [self.guolli])
+        self.assertEqual(dict_entry.translationGroups[0].translationLemmas, [])
+        self.assertEqual(
+            [
+                [term.expression for term in restore_concept(concept).terms]
+                for concept in articles["fisk"].concepts
+            ],
+            [[self.guolli], []],
+        )
@@ -0,0 +1,102 @@
+"""Bounded caches for results that only change when the content is reimported."""
+import threading
+import time
+from collections import OrderedDict
+
+from mongoengine.connection import get_db
+
+from .metrics import record_cache_lookup
+
+CACHES = {}
+"""All caches by name, for inspection of their statistics."""
+
+_MISSING = object()
+
+
+def dataset_version():
+    """Name the imported dataset.
+
+    Every import writes to a new, dated database, so its name changes
+    whenever the content does.
+    """
+    return get_db().name
+
+
+class LRUCache:
+    """A thread safe, size bounded least recently used cache.
+
+    Args:
+        name: the name of the cache in CACHES
+        maxsize: max number of entries, 0 turns the cache off
+        ttl: seconds an entry stays valid, None to keep it until evicted
+    """
+
+    def __init__(self, name, maxsize=1024, ttl=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        CACHES[name] = self
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        """Get the value of key, marking it as recently used."""
+        with self.lock:
+            entry = self.entries.get(key, _MISSING)
+            if entry is not _MISSING and self.is_expired(entry):
+                del self.entries[key]
+                entry = _MISSING
+
+            record_cache_lookup(self.name, entry is not _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, value):
+        """Store value, evicting the least recently used entries if full."""
+        if not self.maxsize:
+            return
+
+        with self.lock:
+            self.entries[key] = (time.monotonic(), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Get the value of key, computing and storing it on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+
+        return value
+
+    def is_expired(self, entry):
+        return self.ttl is not None and time.monotonic() - entry[0] > self.ttl
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """Report the size and the hit, miss and eviction counts."""
+        return {
+            "name": self.name,
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,63 @@
+"""ETags of GraphQL queries, changing whenever the dataset or the code does."""
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+from graphql.error import GraphQLSyntaxError
+from graphql.language.parser import parse
+from graphql.language.printer import print_ast
+
+
+@lru_cache(maxsize=1024)
+def normalise_query(query):
+    """Print query in a canonical form, so that layout does not matter.
+
+    Returns:
+        str: the normalised query, or query itself if it does not parse
+    """
+    try:
+        return print_ast(parse(query))
+    except GraphQLSyntaxError:
+        return query
+
+
+def files_version(paths):
+    """Make a version that changes whenever any of the files is replaced.
+
+    The code and the FSTs are only read when a worker starts, so their
+    sizes and modification times are enough to tell deployments apart.
+
+    Args:
+        paths: paths of the files the results depend on
+
+    Returns:
+        str: a hash of the paths, sizes and modification times of the files
+    """
+    digest = hashlib.sha256()
+    for path in sorted(str(path) for path in paths):
+        stat = os.stat(path)
+        digest.update(f"{path}\0{stat.st_size}\0{stat.st_mtime_ns}\0".encode("utf-8"))
+
+    return digest.hexdigest()
+
+
+def make_etag(version, query, variables, operation_name):
+    """Make a strong ETag for the result of a query.
+
+    Args:
+        version: the versions of the dataset and the code the query is
+            run with, anything json serialisable
+        query: the query text
+        variables: a dict of variables, or None
+        operation_name: the operation to run, or None
+
+    Returns:
+        str: a quoted ETag
+    """
+    key = json.dumps(
+        [version, normalise_query(query), variables or {}, operation_name],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return '"{}"'.format(hashlib.sha256(key.encode("utf-8")).hexdigest())
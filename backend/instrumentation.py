@@ -0,0 +1,193 @@
+"""Timing of resolvers, and counts of database commands and FST lookups.
+
+The numbers of the request being handled by a thread are collected in a
+RequestStats, and added to the in-memory AGGREGATE when the request is done.
+"""
+import threading
+import time
+from collections import Counter, defaultdict
+
+from pymongo.monitoring import CommandListener
+from promise import is_thenable
+
+from .metrics import FIELD_SECONDS, FST_LOOKUPS, MONGO_COMMANDS
+
+_CURRENT = threading.local()
+
+
+class FieldStats:
+    """The number of times a field was resolved, and the total wall time."""
+
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def add(self, count, seconds):
+        self.count += count
+        self.seconds += seconds
+
+    def as_dict(self):
+        return {"count": self.count, "seconds": round(self.seconds, 6)}
+
+
+class RequestStats:
+    """What it took to answer a request, or a number of them."""
+
+    def __init__(self):
+        self.requests = 0
+        self.seconds = 0.0
+        self.fields = defaultdict(FieldStats)
+        self.mongo_commands = Counter()
+        self.mongo_documents = 0
+        self.mongo_seconds = 0.0
+        self.fst_lookups = Counter()
+
+    def add(self, other):
+        """Add the numbers of other to these."""
+        self.requests += other.requests
+        self.seconds += other.seconds
+        for name, field_stats in other.fields.items():
+            self.fields[name].add(field_stats.count, field_stats.seconds)
+        self.mongo_commands.update(other.mongo_commands)
+        self.mongo_documents += other.mongo_documents
+        self.mongo_seconds += other.mongo_seconds
+        self.fst_lookups.update(other.fst_lookups)
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "seconds": round(self.seconds, 6),
+            "fields": {
+                name: field_stats.as_dict()
+                for name, field_stats in sorted(self.fields.items())
+            },
+            "mongo": {
+                "commands": dict(self.mongo_commands),
+                "documents": self.mongo_documents,
+                "seconds": round(self.mongo_seconds, 6),
+            },
+            "fstLookups": dict(self.fst_lookups),
+        }
+
+
+class Aggregate:
+    """The sum of the stats of all requests handled by this process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stats = RequestStats()
+
+    def add(self, stats):
+        with self.lock:
+            self.stats.add(stats)
+
+    def as_dict(self):
+        with self.lock:
+            return self.stats.as_dict()
+
+
+AGGREGATE = Aggregate()
+
+
+def start_request():
+    """Start collecting the stats of the request handled by this thread."""
+    _CURRENT.stats = RequestStats()
+    _CURRENT.started = time.perf_counter()
+    return _CURRENT.stats
+
+
+def current_stats():
+    """Get the stats of the current request, None outside of requests."""
+    return getattr(_CURRENT, "stats", None)
+
+
+def finish_request():
+    """Stop collecting, adding the stats of the request to AGGREGATE."""
+    stats = current_stats()
+    if stats is None:
+        return None
+
+    stats.requests = 1
+    stats.seconds = time.perf_counter() - _CURRENT.started
+    _CURRENT.stats = None
+    AGGREGATE.add(stats)
+    return stats
+
+
+def record_fst_lookup(language):
+    """Count an FST lookup in the transducers of language."""
+    FST_LOOKUPS.labels(language).inc()
+    stats = current_stats()
+    if stats is not None:
+        stats.fst_lookups[language] += 1
+
+
+def count_documents(reply):
+    """Count the documents in the reply of a mongodb command."""
+    cursor = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+
+    return 0
+
+
+class MongoCommandListener(CommandListener):
+    """Count the commands sent to mongodb, and the documents returned.
+
+    Commands are run synchronously, in the thread that sends them, so they
+    are added to the stats of the request handled by that thread.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self.record(event, count_documents(event.reply))
+
+    def failed(self, event):
+        self.record(event, 0)
+
+    @staticmethod
+    def record(event, documents):
+        MONGO_COMMANDS.labels(event.command_name).inc()
+        stats = current_stats()
+        if stats is not None:
+            stats.mongo_commands[event.command_name] += 1
+            stats.mongo_documents += documents
+            stats.mongo_seconds += event.duration_micros / 1e6
+
+
+class TimingMiddleware:
+    """A graphene middleware timing the resolvers of each field.
+
+    Fields are named by their parent type, like Query.stemList, so that
+    the stats of a field are summed over all the objects it is resolved on.
+    The top level fields are also timed in the FIELD_SECONDS histogram.
+    Resolvers returning promises are timed until the promise is resolved.
+    """
+
+    def resolve(self, next, root, info, **kwargs):
+        stats = current_stats()
+        is_top_level = info.parent_type is info.schema.get_query_type()
+        if stats is None and not is_top_level:
+            return next(root, info, **kwargs)
+
+        started = time.perf_counter()
+        result = next(root, info, **kwargs)
+
+        def record(value):
+            seconds = time.perf_counter() - started
+            if is_top_level:
+                FIELD_SECONDS.labels(info.field_name).observe(seconds)
+            if stats is not None:
+                stats.fields[f"{info.parent_type.name}.{info.field_name}"].add(
+                    1, seconds
+                )
+            return value
+
+        if is_thenable(result):
+            return result.then(record)
+
+        return record(result)
@@ -0,0 +1,52 @@
+"""Prometheus metrics of the GraphQL fields, FST lookups, mongodb and caches.
+
+When PROMETHEUS_MULTIPROC_DIR is set, as it must be under gunicorn, each
+worker writes its metrics to that directory and the metrics view sums them
+over all workers.
+"""
+import os
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client import REGISTRY
+
+FIELD_SECONDS = Histogram(
+    "satni_graphql_field_seconds",
+    "Time spent resolving the top level GraphQL fields.",
+    ["field"],
+)
+FST_LOOKUPS = Counter(
+    "satni_fst_lookups_total", "Lookups in the FSTs of a language.", ["language"]
+)
+MONGO_COMMANDS = Counter(
+    "satni_mongo_commands_total", "Commands sent to mongodb.", ["command"]
+)
+CACHE_REQUESTS = Counter(
+    "satni_cache_requests_total",
+    "Lookups in a cache, by whether they were hits or misses.",
+    ["cache", "result"],
+)
+
+
+def record_cache_lookup(cache, hit):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def get_registry():
+    """Get the registry of this process, or one summing those of all workers."""
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def export():
+    """Write all metrics in the Prometheus text format."""
+    return generate_latest(get_registry())
@@ -0,0 +1,124 @@
+"""Persisted queries, parsed and validated once per process."""
+import hashlib
+import json
+import logging
+import threading
+from functools import partial
+
+from graphql.backend.base import GraphQLDocument
+from graphql.backend.core import GraphQLCoreBackend, execute_and_validate
+from graphql.language.parser import parse
+from graphql.validation import validate
+
+from .metrics import record_cache_lookup
+
+LOGGER = logging.getLogger(__name__)
+
+NOT_FOUND = "PersistedQueryNotFound"
+"""The error clients get for unknown hashes, so that they resend the query."""
+
+
+def query_hash(query):
+    """Hash a query the way clients do, as the sha256 hex digest of its text."""
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def get_persisted_query_hash(extensions):
+    """Find the hash in the extensions of a request.
+
+    Args:
+        extensions: a dict, or json text, like
+            {"persistedQuery": {"version": 1, "sha256Hash": "..."}}
+
+    Returns:
+        str: the hash, None if there is none
+    """
+    if isinstance(extensions, str):
+        try:
+            extensions = json.loads(extensions)
+        except ValueError:
+            return None
+
+    if not isinstance(extensions, dict):
+        return None
+
+    persisted_query = extensions.get("persistedQuery")
+    if not isinstance(persisted_query, dict):
+        return None
+
+    return persisted_query.get("sha256Hash")
+
+
+def read_queries(paths):
+    """Read the queries of json files in the format of the example queries."""
+    queries = []
+    for path in paths:
+        try:
+            with open(path) as json_stream:
+                queries.append(json.load(json_stream)["query"])
+        except (OSError, ValueError, KeyError) as error:
+            LOGGER.warning(f"No persisted query in {path}: {error}")
+
+    return queries
+
+
+class PersistedQueryBackend(GraphQLCoreBackend):
+    """A graphql backend that skips parsing and validation of known queries.
+
+    The documents of the queries are parsed and validated against the
+    schema the first time it is asked for, and then executed without
+    validation. Other queries are parsed and validated as usual.
+
+    Args:
+        queries: the texts of the persisted queries
+    """
+
+    def __init__(self, queries, executor=None):
+        super().__init__(executor=executor)
+        self.queries = {query_hash(query): query for query in queries}
+        self.documents = None
+        self.lock = threading.Lock()
+
+    def get_query(self, digest):
+        """Get the text of a persisted query, None if the hash is unknown."""
+        return self.queries.get(digest)
+
+    def get_documents(self, schema):
+        with self.lock:
+            if self.documents is None:
+                self.documents = {}
+                for digest, query in self.queries.items():
+                    document = self.make_document(schema, query)
+                    if document is not None:
+                        self.documents[digest] = document
+
+        return self.documents
+
+    def make_document(self, schema, query):
+        """Parse and validate query, None if it is not valid."""
+        document_ast = parse(query)
+        errors = validate(schema, document_ast)
+        if errors:
+            LOGGER.warning(f"Invalid persisted query {query_hash(query)}: {errors}")
+            return None
+
+        return GraphQLDocument(
+            schema=schema,
+            document_string=query,
+            document_ast=document_ast,
+            execute=partial(
+                execute_and_validate,
+                schema,
+                document_ast,
+                validate=False,
+                **self.execute_params,
+            ),
+        )
+
+    def document_from_string(self, schema, document_string):
+        document = self.get_documents(schema).get(query_hash(document_string))
+        record_cache_lookup("persisted_queries", document is not None)
+        if document is None:
+            return super().document_from_string(schema, document_string)
+
+        return document
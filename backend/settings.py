@@ -15,6 +15,8 @@ import os
 import environ
 import mongoengine
 
+from backend.instrumentation import MongoCommandListener
+
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -145,13 +147,73 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/2.1/howto/static-files/
 STATIC_URL = "/static/"
+# Time resolvers and count database commands and FST lookups of each request
+INSTRUMENTATION = env.bool("INSTRUMENTATION", default=True)
+# Export the Prometheus metrics at /metrics
+METRICS = env.bool("METRICS", default=True)
+
+# Both the stats of each request and the metrics are recorded by the mongodb
+# listener and the resolver middleware
 mongoengine.connect(
-    env("_MONGODB_NAME"), host=env("_MONGODB_HOST"), port=int(env("_MONGODB_PORT"))
+    env("_MONGODB_NAME"),
+    host=env("_MONGODB_HOST"),
+    port=int(env("_MONGODB_PORT")),
+    event_listeners=[MongoCommandListener()] if INSTRUMENTATION or METRICS else [],
 )
 
 GRAPHENE = {
     "SCHEMA": "backend.schema.schema",
+    "MIDDLEWARE": ["backend.instrumentation.TimingMiddleware"]
+    if INSTRUMENTATION or METRICS
+    else [],
 }
 
 CORS_ORIGIN_ALLOW_ALL = True
 CSRF_COOKIE_SECURE = True
+
+# Keep an in-memory index of the read-only stems collection in each worker
+STEM_INDEX = env.bool("STEM_INDEX", default=False)
+
+# Cache stemList and hasStem results, per dataset. A size of 0 turns the cache
+# off, a TTL (seconds) of 0 keeps entries until they are evicted.
+STEM_CACHE_SIZE = env.int("STEM_CACHE_SIZE", default=10000)
+STEM_CACHE_TTL = env.int("STEM_CACHE_TTL", default=0)
+
+# Where from_dump writes the records of the stemCompletions index
+STEM_COMPLETIONS_DIR = env.str("STEM_COMPLETIONS_DIR", default=BASE_DIR)
+
+# Serve dictEntryList and conceptList from the articles made by the
+# make_articles script
+ARTICLE_SNAPSHOTS = env.bool("ARTICLE_SNAPSHOTS", default=False)
+
+# Dictionaries that are also looked up from their translations
+REVERSE_DICTS = env.list("REVERSE_DICTS", default=["sammallahtismefin"])
+
+# Seconds browsers and proxies may cache the results of GET queries before
+# revalidating them, 0 turns caching off
+GRAPHQL_CACHE_MAX_AGE = env.int("GRAPHQL_CACHE_MAX_AGE", default=600)
+
+# Example queries, relative to BASE_DIR, that clients may send by the sha256
+# hash of their query text
+PERSISTED_QUERIES = env.list(
+    "PERSISTED_QUERIES",
+    default=[
+        "lemmas.json",
+        "articles.json",
+        "hasStem.json",
+        "generated.json",
+        "lemmatised.json",
+    ],
+)
+
+# Number of lookups each lemmatiser and generator transducer remembers, 0
+# turns the cache off
+FST_CACHE_SIZE = env.int("FST_CACHE_SIZE", default=10000)
+
+# Seconds a query may spend lemmatising, the words and languages that are left
+# when it has passed are reported as timed out
+LEMMATISER_TIMEOUT = env.float("LEMMATISER_TIMEOUT", default=5.0)
+
+# Max number of characters, and of different words, in a lemmatisedText query
+LEMMATISED_TEXT_MAX_LENGTH = env.int("LEMMATISED_TEXT_MAX_LENGTH", default=10000)
+LEMMATISED_TEXT_MAX_WORDS = env.int("LEMMATISED_TEXT_MAX_WORDS", default=500)
@@ -0,0 +1,61 @@
+"""Test the result caches."""
+import unittest
+from unittest import mock
+
+from backend.cache import CACHES, LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test the LRUCache class."""
+
+    def setUp(self):
+        self.cache = LRUCache("test", maxsize=2)
+
+    def test_hit_and_miss(self):
+        assert self.cache.get("a") is None
+        self.cache.put("a", 1)
+        assert self.cache.get("a") == 1
+        assert (self.cache.hits, self.cache.misses) == (1, 1)
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put("a", 1)
+        self.cache.put("b", 2)
+        self.cache.get("a")
+        self.cache.put("c", 3)
+        assert self.cache.get("b") is None
+        assert self.cache.get("a") == 1
+        assert self.cache.evictions == 1
+
+    def test_get_or_compute(self):
+        computed = []
+
+        def compute():
+            computed.append(1)
+            return "value"
+
+        assert self.cache.get_or_compute("key", compute) == "value"
+        assert self.cache.get_or_compute("key", compute) == "value"
+        assert len(computed) == 1
+
+    def test_caches_falsy_values(self):
+        self.cache.put("empty", [])
+        assert self.cache.get("empty", "missing") == []
+
+    def test_ttl(self):
+        cache = LRUCache("test_ttl", maxsize=2, ttl=10)
+        with mock.patch("backend.cache.time.monotonic", return_value=100):
+            cache.put("a", 1)
+        with mock.patch("backend.cache.time.monotonic", return_value=105):
+            assert cache.get("a") == 1
+        with mock.patch("backend.cache.time.monotonic", return_value=111):
+            assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_turned_off(self):
+        cache = LRUCache("test_off", maxsize=0)
+        cache.put("a", 1)
+        assert cache.get("a") is None
+
+    def test_registered(self):
+        assert CACHES["test"] is self.cache
+        assert self.cache.stats()["maxsize"] == 2
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+from backend.etags import files_version, make_etag, normalise_query
+
+QUERY = "query HasStem($stem: String!) { hasStem(exact: $stem) { stem } }"
+
+
+class TestETags(unittest.TestCase):
+    def test_layout_does_not_matter(self):
+        self.assertEqual(
+            normalise_query(QUERY),
+            normalise_query(QUERY.replace(" { ", "\n{\n  ").replace(" }", "\n}")),
+        )
+
+    def test_invalid_query_is_kept(self):
+        self.assertEqual(normalise_query("{ hasStem("), "{ hasStem(")
+
+    def test_variable_order_does_not_matter(self):
+        self.assertEqual(
+            make_etag("satni", QUERY, {"stem": "bil", "langs": ["sme"]}, None),
+            make_etag("satni", QUERY, {"langs": ["sme"], "stem": "bil"}, None),
+        )
+
+    def test_etag_changes_with_dataset_and_variables(self):
+        etag = make_etag("satni_20200101", QUERY, {"stem": "bil"}, "HasStem")
+
+        self.assertTrue(etag.startswith('"') and etag.endswith('"'))
+        self.assertNotEqual(
+            etag, make_etag("satni_20200202", QUERY, {"stem": "bil"}, "HasStem")
+        )
+        self.assertNotEqual(
+            etag, make_etag("satni_20200101", QUERY, {"stem": "biila"}, "HasStem")
+        )
+        self.assertNotEqual(
+            etag, make_etag("satni_20200101", QUERY, {"stem": "bil"}, None)
+        )
+
+    def test_no_variables(self):
+        self.assertEqual(
+            make_etag("satni", QUERY, None, None), make_etag("satni", QUERY, {}, None)
+        )
+
+    def test_files_version_changes_with_the_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "analyser-gt-desc.hfstol")
+            with open(path, "w") as transducer:
+                transducer.write("fst")
+            version = files_version([path])
+
+            self.assertEqual(version, files_version([path]))
+            with open(path, "w") as transducer:
+                transducer.write("new fst")
+            self.assertNotEqual(version, files_version([path]))
+
+    def test_etag_changes_with_code_version(self):
+        self.assertNotEqual(
+            make_etag(["satni", "code1"], QUERY, None, None),
+            make_etag(["satni", "code2"], QUERY, None, None),
+        )
@@ -0,0 +1,91 @@
+import unittest
+from types import SimpleNamespace
+
+from promise import Promise
+
+from backend import instrumentation
+from backend.instrumentation import (
+    Aggregate,
+    MongoCommandListener,
+    TimingMiddleware,
+    current_stats,
+    finish_request,
+    record_fst_lookup,
+    start_request,
+)
+from backend.metrics import FIELD_SECONDS
+
+
+def command_event(command_name, reply=None):
+    return SimpleNamespace(
+        command_name=command_name, reply=reply or {}, duration_micros=1500
+    )
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.aggregate = Aggregate()
+        self.original_aggregate = instrumentation.AGGREGATE
+        instrumentation.AGGREGATE = self.aggregate
+        self.stats = start_request()
+
+    def tearDown(self):
+        finish_request()
+        instrumentation.AGGREGATE = self.original_aggregate
+
+    def test_nothing_is_recorded_outside_requests(self):
+        finish_request()
+
+        record_fst_lookup("sme")
+
+        self.assertIsNone(current_stats())
+        self.assertEqual(self.stats.fst_lookups, {})
+
+    def test_finished_requests_are_aggregated(self):
+        record_fst_lookup("sme")
+        finish_request()
+        start_request()
+        record_fst_lookup("sme")
+        record_fst_lookup("fin")
+        finish_request()
+
+        stats = self.aggregate.as_dict()
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["fstLookups"], {"sme": 2, "fin": 1})
+
+    def test_mongo_commands_and_documents(self):
+        listener = MongoCommandListener()
+        listener.succeeded(
+            command_event("find", {"cursor": {"firstBatch": [{}, {}], "id": 1}})
+        )
+        listener.succeeded(command_event("getMore", {"cursor": {"nextBatch": [{}]}}))
+        listener.succeeded(command_event("count", {"n": 12}))
+        listener.failed(command_event("aggregate"))
+
+        mongo = self.stats.as_dict()["mongo"]
+        self.assertEqual(
+            mongo["commands"], {"find": 1, "getMore": 1, "count": 1, "aggregate": 1}
+        )
+        self.assertEqual(mongo["documents"], 3)
+        self.assertAlmostEqual(mongo["seconds"], 0.006)
+
+    def test_fields_are_timed(self):
+        middleware = TimingMiddleware()
+        query_type = SimpleNamespace(name="Query")
+        info = SimpleNamespace(
+            parent_type=query_type,
+            field_name="stemList",
+            schema=SimpleNamespace(get_query_type=lambda: query_type),
+        )
+        seconds = FIELD_SECONDS.labels("stemList")._sum.get()
+
+        self.assertEqual(
+            middleware.resolve(lambda root, info, **kwargs: "bil", None, info), "bil"
+        )
+        promise = middleware.resolve(
+            lambda root, info, **kwargs: Promise.resolve("biila"), None, info
+        )
+
+        self.assertEqual(promise.get(), "biila")
+        self.assertEqual(self.stats.fields["Query.stemList"].count, 2)
+        self.assertGreater(FIELD_SECONDS.labels("stemList")._sum.get(), seconds)
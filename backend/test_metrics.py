@@ -0,0 +1,30 @@
+import os
+import unittest
+from unittest import mock
+
+from prometheus_client import REGISTRY
+
+from backend.metrics import CACHE_REQUESTS, export, get_registry, record_cache_lookup
+
+
+class TestMetrics(unittest.TestCase):
+    def test_cache_lookups(self):
+        hits = CACHE_REQUESTS.labels("test", "hit")._value.get()
+        misses = CACHE_REQUESTS.labels("test", "miss")._value.get()
+
+        record_cache_lookup("test", True)
+        record_cache_lookup("test", False)
+        record_cache_lookup("test", False)
+
+        self.assertEqual(CACHE_REQUESTS.labels("test", "hit")._value.get(), hits + 1)
+        self.assertEqual(CACHE_REQUESTS.labels("test", "miss")._value.get(), misses + 2)
+        self.assertIn(b'satni_cache_requests_total{cache="test"', export())
+
+    def test_registry_of_this_process(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+            self.assertIs(get_registry(), REGISTRY)
+
+    def test_registry_of_all_workers(self):
+        with mock.patch.dict(os.environ, {"PROMETHEUS_MULTIPROC_DIR": "/tmp"}):
+            self.assertIsNot(get_registry(), REGISTRY)
@@ -0,0 +1,86 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from graphql import (
+    GraphQLArgument,
+    GraphQLField,
+    GraphQLObjectType,
+    GraphQLSchema,
+    GraphQLString,
+)
+
+from backend import persisted
+from backend.persisted import (
+    PersistedQueryBackend,
+    get_persisted_query_hash,
+    query_hash,
+    read_queries,
+)
+
+SCHEMA = GraphQLSchema(
+    query=GraphQLObjectType(
+        "Query",
+        {
+            "hasStem": GraphQLField(
+                GraphQLString,
+                args={"exact": GraphQLArgument(GraphQLString)},
+                resolver=lambda root, info, exact: exact,
+            )
+        },
+    )
+)
+QUERY = "query HasStem($exact: String) { hasStem(exact: $exact) }"
+
+
+class TestPersistedQueries(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(persisted.LOGGER, "warning")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.backend = PersistedQueryBackend([QUERY, "{ noSuchField }"])
+
+    def test_query_hash(self):
+        self.assertEqual(len(query_hash(QUERY)), 64)
+        self.assertEqual(self.backend.get_query(query_hash(QUERY)), QUERY)
+        self.assertIsNone(self.backend.get_query(query_hash("{ hasStem }")))
+
+    def test_hash_in_extensions(self):
+        extensions = {"persistedQuery": {"version": 1, "sha256Hash": "abc"}}
+
+        self.assertEqual(get_persisted_query_hash(extensions), "abc")
+        self.assertEqual(get_persisted_query_hash(json.dumps(extensions)), "abc")
+        self.assertIsNone(get_persisted_query_hash(None))
+        self.assertIsNone(get_persisted_query_hash("{"))
+        self.assertIsNone(get_persisted_query_hash({"persistedQuery": "abc"}))
+
+    def test_invalid_queries_are_not_persisted(self):
+        self.assertEqual(list(self.backend.get_documents(SCHEMA)), [query_hash(QUERY)])
+
+    def test_persisted_document_is_reused_without_validation(self):
+        document = self.backend.document_from_string(SCHEMA, QUERY)
+
+        self.assertIs(document, self.backend.document_from_string(SCHEMA, QUERY))
+        with mock.patch("graphql.backend.core.validate") as validate:
+            result = document.execute(variable_values={"exact": "bil"})
+
+        validate.assert_not_called()
+        self.assertEqual(result.data, {"hasStem": "bil"})
+
+    def test_other_queries_are_validated(self):
+        document = self.backend.document_from_string(SCHEMA, "{ noSuchField }")
+
+        self.assertTrue(document.execute().invalid)
+
+    def test_read_queries(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "hasStem.json")
+            with open(path, "w") as json_stream:
+                json.dump({"operationName": "HasStem", "query": QUERY}, json_stream)
+
+            queries = read_queries([path, os.path.join(directory, "missing")])
+
+        self.assertEqual(queries, [QUERY])
+        persisted.LOGGER.warning.assert_called_once()
@@ -0,0 +1,13 @@
+"""The caches of the lemmatiser and generator transducers."""
+from django.conf import settings
+
+from .cache import LRUCache
+
+
+def fst_cache(name):
+    """Make the cache of a transducer, remembering FST_CACHE_SIZE lookups.
+
+    Args:
+        name: the name of the cache in CACHES, like lemmatiser-analyser-sme
+    """
+    return LRUCache(name, maxsize=settings.FST_CACHE_SIZE)
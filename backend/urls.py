@@ -13,15 +13,19 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path
 from django.views.decorators.csrf import csrf_exempt
-from graphene_django.views import GraphQLView
 
-from .views import index
+from .views import CachedGraphQLView, index, metrics, stats
 
 urlpatterns = [
     path("", index, name="index"),
     path("admin/", admin.site.urls),
-    path("graphql/", csrf_exempt(GraphQLView.as_view(graphiql=True))),
+    path("graphql/", csrf_exempt(CachedGraphQLView.as_view(graphiql=True))),
+    path("stats/", stats, name="stats"),
 ]
+
+if settings.METRICS:
+    urlpatterns.append(path("metrics", metrics, name="metrics"))
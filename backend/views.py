@@ -1,5 +1,184 @@
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
 from django.views.generic import TemplateView
 from django.views.decorators.cache import never_cache
+from graphene_django.views import GraphQLView, HttpError
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from .cache import CACHES, dataset_version
+from .etags import files_version, make_etag
+from .instrumentation import AGGREGATE, current_stats, finish_request, start_request
+from .metrics import export, record_cache_lookup
+from .persisted import (
+    NOT_FOUND,
+    PersistedQueryBackend,
+    get_persisted_query_hash,
+    read_queries,
+)
 
 # Serve Single Page Application
 index = never_cache(TemplateView.as_view(template_name="index.html"))
+
+
+@never_cache
+def stats(request):
+    """Show the summed stats of the requests and caches of this process."""
+    return JsonResponse(
+        {
+            "requests": AGGREGATE.as_dict(),
+            "caches": [cache.stats() for cache in CACHES.values()],
+        }
+    )
+
+
+@never_cache
+def metrics(request):
+    """Export the metrics of all workers, for Prometheus to scrape."""
+    return HttpResponse(export(), content_type=CONTENT_TYPE_LATEST)
+
+
+PERSISTED_QUERIES = PersistedQueryBackend(
+    read_queries(
+        os.path.join(settings.BASE_DIR, name) for name in settings.PERSISTED_QUERIES
+    )
+)
+
+# The lemmatiser and generator results depend on the code and the FSTs as
+# well as on the dataset
+APP_VERSION = files_version(
+    [
+        *Path(settings.BASE_DIR).glob("*/*.py"),
+        *Path("/usr/share/giella").glob("*/*.hfstol"),
+    ]
+)
+
+
+class CachedGraphQLView(GraphQLView):
+    """Let browsers and proxies cache the results of GET queries.
+
+    The content only changes when it is reimported into a new database, so
+    results are tagged with an ETag made from the database name, the
+    version of the code and FSTs and the normalised query, and can be
+    revalidated with If-None-Match.
+
+    Persisted queries may be sent as the sha256 hash of their text, in the
+    persistedQuery extension, and are executed without being parsed or
+    validated again.
+
+    The stats of a request are added to the extensions of its response
+    when the stats parameter is given.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("backend", PERSISTED_QUERIES)
+        super().__init__(*args, **kwargs)
+
+    def dispatch(self, request, *args, **kwargs):
+        if not settings.INSTRUMENTATION:
+            return self.dispatch_cached(request, *args, **kwargs)
+
+        start_request()
+        try:
+            return self.dispatch_cached(request, *args, **kwargs)
+        finally:
+            finish_request()
+
+    def dispatch_cached(self, request, *args, **kwargs):
+        etag = self.get_etag(request)
+        if etag is not None:
+            conditional = get_conditional_response(request, etag=etag)
+            record_cache_lookup(
+                "etags", conditional is not None and conditional.status_code == 304
+            )
+            if conditional is not None:
+                # A failed If-Match precondition is not a result to cache
+                if conditional.status_code == 304:
+                    self.add_cache_headers(conditional, etag)
+                return conditional
+
+        response = super().dispatch(request, *args, **kwargs)
+
+        if (
+            etag is not None
+            and response.status_code == 200
+            and not getattr(request, "graphql_errors", True)
+        ):
+            self.add_cache_headers(response, etag)
+
+        return response
+
+    def execute_graphql_request(self, request, *args, **kwargs):
+        execution_result = super().execute_graphql_request(request, *args, **kwargs)
+        # Errors may be temporary, so such results are not cached
+        request.graphql_errors = execution_result is None or bool(
+            execution_result.errors
+        )
+        return execution_result
+
+    @staticmethod
+    def get_graphql_params(request, data):
+        """Look up the text of persisted queries sent without one."""
+        query, variables, operation_name, id = GraphQLView.get_graphql_params(
+            request, data
+        )
+
+        if not query:
+            digest = get_persisted_query_hash(
+                request.GET.get("extensions") or data.get("extensions")
+            )
+            if digest is not None:
+                query = PERSISTED_QUERIES.get_query(digest)
+                if query is None:
+                    raise HttpError(HttpResponseBadRequest(NOT_FOUND))
+
+        return query, variables, operation_name, id
+
+    def get_etag(self, request):
+        """Make the ETag of a GET query, None if it should not be cached."""
+        if (
+            request.method != "GET"
+            or not settings.GRAPHQL_CACHE_MAX_AGE
+            or self.wants_stats(request)
+            or (self.graphiql and self.can_display_graphiql(request, {}))
+        ):
+            return None
+
+        try:
+            query, variables, operation_name, _ = self.get_graphql_params(request, {})
+        except HttpError:
+            return None
+
+        if not query:
+            return None
+
+        return make_etag(
+            [dataset_version(), APP_VERSION], query, variables, operation_name
+        )
+
+    def json_encode(self, request, d, pretty=False):
+        stats = current_stats()
+        if stats is not None and self.wants_stats(request):
+            d = {**d, "extensions": {"stats": stats.as_dict()}}
+
+        return super().json_encode(request, d, pretty=pretty)
+
+    @staticmethod
+    def wants_stats(request):
+        return "stats" in request.GET
+
+    @staticmethod
+    def add_cache_headers(response, etag):
+        response["ETag"] = etag
+        patch_cache_control(
+            response, public=True, max_age=settings.GRAPHQL_CACHE_MAX_AGE
+        )
+        # GraphiQL is served from the same url to browsers asking for html
+        patch_vary_headers(response, ["Accept"])
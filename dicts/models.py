@@ -28,7 +28,13 @@ class TranslationGroup(EmbeddedDocument):
 
 
 class DictEntry(Document):
-    meta = {"collection": "dicts"}
+    meta = {
+        "collection": "dicts",
+        "indexes": [
+            ("lookupLemmaStrings", "dictName", "srcLang", "targetLang"),
+            ("translationLemmaStrings", "dictName", "srcLang", "targetLang"),
+        ],
+    }
     dictName = StringField(required=True)
     srcLang = StringField(required=True)
     targetLang = StringField(required=True)
@@ -36,3 +42,7 @@ class DictEntry(Document):
     translationGroups = ListField(
         EmbeddedDocumentField(TranslationGroup), required=True
     )
+    # The lemma strings of lookupLemmas and translationLemmas, so that
+    # entries are found with one indexed query, also in reverse.
+    lookupLemmaStrings = ListField(StringField())
+    translationLemmaStrings = ListField(StringField())
@@ -1,16 +1,109 @@
 import logging
 
 import graphene
+from django.conf import settings
 from graphene_mongo.fields import MongoengineConnectionField
-from lemmas.models import Lemma
 from mongoengine.queryset.visitor import Q
 
+from articles.snapshots import get_articles, restore_dict_entry, serves_articles
+
 from .models import DictEntry
-from .types import DictEntryType
+from .types import DictEntriesType, DictEntryType
 
 LOGGER = logging.getLogger(__name__)
 
 
+def get_reverse_dicts(wanted_dicts):
+    """Find the wanted dictionaries that may be looked up in reverse."""
+    return [name for name in wanted_dicts if name in settings.REVERSE_DICTS]
+
+
+def get_dict_entry_filter(exacts, src_langs, target_langs, wanted_dicts):
+    """Filter the dict entries found by any of exacts in the wanted dictionaries.
+
+    Entries of reverse dictionaries are also found by their translations,
+    when the translation is in one of the source languages and the entry in
+    one of the target languages.
+    """
+    lookup_filter = Q(
+        lookupLemmaStrings__in=exacts,
+        srcLang__in=src_langs,
+        targetLang__in=target_langs,
+        dictName__in=wanted_dicts,
+    )
+
+    reverse_dicts = get_reverse_dicts(wanted_dicts)
+    if reverse_dicts:
+        lookup_filter |= Q(
+            translationLemmaStrings__in=exacts,
+            srcLang__in=target_langs,
+            targetLang__in=src_langs,
+            dictName__in=reverse_dicts,
+        )
+
+    return lookup_filter
+
+
+def is_wanted_dict_entry(dict_entry, exact, src_langs, target_langs, wanted_dicts):
+    """Check if a dict entry is found by exact, as in get_dict_entry_filter."""
+    if (
+        exact in dict_entry.lookupLemmaStrings
+        and dict_entry.srcLang in src_langs
+        and dict_entry.targetLang in target_langs
+        and dict_entry.dictName in wanted_dicts
+    ):
+        return True
+
+    return (
+        exact in dict_entry.translationLemmaStrings
+        and dict_entry.srcLang in target_langs
+        and dict_entry.targetLang in src_langs
+        and dict_entry.dictName in get_reverse_dicts(wanted_dicts)
+    )
+
+
+def translations_first(exact, dict_entries):
+    """Put the entries found by their translations first."""
+    return sorted(
+        dict_entries,
+        key=lambda dict_entry: exact in dict_entry.lookupLemmaStrings,
+    )
+
+
+def find_dict_entries(info, exacts, src_langs, target_langs, wanted_dicts):
+    """Find the dict entries of many lemmas at once.
+
+    Returns:
+        dict: lists of DictEntries by exact
+    """
+    if serves_articles():
+        candidates = {
+            exact: [restore_dict_entry(snapshot) for snapshot in article.dictEntries]
+            for exact, article in get_articles(info, exacts).items()
+        }
+    else:
+        dict_entries = list(
+            DictEntry.objects(
+                get_dict_entry_filter(exacts, src_langs, target_langs, wanted_dicts)
+            )
+        )
+        candidates = {exact: dict_entries for exact in exacts}
+
+    return {
+        exact: translations_first(
+            exact,
+            [
+                dict_entry
+                for dict_entry in candidates[exact]
+                if is_wanted_dict_entry(
+                    dict_entry, exact, src_langs, target_langs, wanted_dicts
+                )
+            ],
+        )
+        for exact in exacts
+    }
+
+
 class Query(graphene.ObjectType):
     dict_entry_list = graphene.List(
         DictEntryType,
@@ -20,31 +113,21 @@ class Query(graphene.ObjectType):
         wanted_dicts=graphene.List(graphene.String, required=True),
     )
 
+    dict_entries = graphene.List(
+        DictEntriesType,
+        exacts=graphene.List(graphene.String, required=True),
+        src_langs=graphene.List(graphene.String, required=True),
+        target_langs=graphene.List(graphene.String, required=True),
+        wanted_dicts=graphene.List(graphene.String, required=True),
+    )
+
     def resolve_dict_entry_list(self, info, wanted_dicts, exact=None, **kwargs):
         src_langs = kwargs["src_langs"]
         target_langs = kwargs["target_langs"]
 
-        dict_entries = []
-
-        if (
-            "fin" in src_langs
-            and "sme" in target_langs
-            and "sammallahtismefin" in wanted_dicts
-        ):
-            translation_filter = Q(
-                translationGroups__translationLemmas__in=Lemma.objects(lemma=exact)
-            )
-            by_translation_lemma = DictEntry.objects(translation_filter)
-            dict_entries.extend([
-                d for d in by_translation_lemma if d.dictName == "sammallahtismefin"
-            ])
-
-        lookup_filter = Q(lookupLemmas__in=Lemma.objects(lemma=exact))
-
-        by_lookup_lemma = DictEntry.objects(lookup_filter)
-        by_src_lang = [d for d in by_lookup_lemma if d.srcLang in src_langs]
-        by_target_lang = [d for d in by_src_lang if d.targetLang in target_langs]
-        dict_entries.extend([d for d in by_target_lang if d.dictName in wanted_dicts])
+        dict_entries = find_dict_entries(
+            info, [exact], src_langs, target_langs, wanted_dicts
+        )[exact]
 
         if dict_entries:
             LOGGER.info(
@@ -55,3 +138,14 @@ class Query(graphene.ObjectType):
             )
 
         return dict_entries
+
+    def resolve_dict_entries(self, info, exacts, wanted_dicts, **kwargs):
+        """Find the dict entries of many lemmas, grouped by lemma."""
+        by_exact = find_dict_entries(
+            info, exacts, kwargs["src_langs"], kwargs["target_langs"], wanted_dicts
+        )
+
+        return [
+            DictEntriesType(exact=exact, dict_entries=by_exact[exact])
+            for exact in exacts
+        ]
@@ -1,6 +1,9 @@
+import graphene
 from graphene import relay
 from graphene_mongo import MongoengineObjectType
 
+from lemmas.loaders import load_filtered_lemmas
+
 from .models import DictEntry, ExampleGroup, Restriction, TranslationGroup
 
 
@@ -18,7 +21,20 @@ class TranslationGroupType(MongoengineObjectType):
     class Meta:
         model = TranslationGroup
 
+    def resolve_translationLemmas(self, info, **kwargs):
+        return load_filtered_lemmas(info, self._data.get("translationLemmas"), kwargs)
+
 
 class DictEntryType(MongoengineObjectType):
     class Meta:
         model = DictEntry
+
+    def resolve_lookupLemmas(self, info, **kwargs):
+        return load_filtered_lemmas(info, self._data.get("lookupLemmas"), kwargs)
+
+
+class DictEntriesType(graphene.ObjectType):
+    """The dict entries found by a lemma."""
+
+    exact = graphene.String(required=True)
+    dict_entries = graphene.List(DictEntryType, required=True)
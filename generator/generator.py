@@ -6,6 +6,8 @@ from pathlib import Path
 
 import hfst
 
+from lemmatiser.transducers import CachedTransducer
+
 ATTS = re.compile(r"@[^@]+@")
 Analysis = namedtuple("Analysis", "wordform weight")
 
@@ -15,13 +17,30 @@ class ParadigmGenerator:
 
     removable_tags = re.compile(r"\+(IV|TV|Sem/[^+]+)")
 
-    def __init__(self, lang):
-        """Initialise HFST analysers."""
+    def __init__(self, lang, make_cache=None, on_lookup=None):
+        """Initialise HFST analysers.
+
+        Args:
+            lang: the language of the paradigms
+            make_cache: makes the cache of a transducer from its name, like
+                generator-analyser-sme, None looks up without caching
+            on_lookup: called with lang for each lookup in a transducer
+        """
         analyser_path = Path("/usr/share/giella") / lang / "analyser-gt-desc.hfstol"
-        self.analyser = hfst.HfstInputStream(str(analyser_path)).read()
+        self.analyser = CachedTransducer(
+            hfst.HfstInputStream(str(analyser_path)).read(),
+            lang,
+            make_cache(f"generator-analyser-{lang}") if make_cache else None,
+            on_lookup,
+        )
 
         generator_path = Path("/usr/share/giella") / lang / "generator-gt-norm.hfstol"
-        self.generator = hfst.HfstInputStream(str(generator_path)).read()
+        self.generator = CachedTransducer(
+            hfst.HfstInputStream(str(generator_path)).read(),
+            lang,
+            make_cache(f"generator-generator-{lang}") if make_cache else None,
+            on_lookup,
+        )
         self.lang = lang
 
     def read_taglist(self):
@@ -1,12 +1,15 @@
 """Setup a schema to get results from the lemmatiser."""
 import graphene
 
+from backend.instrumentation import record_fst_lookup
+from backend.transducers import fst_cache
+
 from .generator import ParadigmGenerator
 from .types import GeneratorResultType
 
 GENERATOR_LANGS = ["fin", "sma", "sme", "smj", "smn", "sms"]
 GENERATORS = {
-    language: ParadigmGenerator(language)
+    language: ParadigmGenerator(language, fst_cache, record_fst_lookup)
     for language in GENERATOR_LANGS
 }
 
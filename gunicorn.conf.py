@@ -0,0 +1,17 @@
+"""Gunicorn settings, read from the working directory of the service."""
+import os
+
+from prometheus_client import multiprocess
+
+
+def child_exit(server, worker):
+    """Stop summing the live metrics of workers that have exited."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def post_worker_init(worker):
+    """Build the in-memory indexes before the worker takes any requests."""
+    from stems.schema import build_indexes
+
+    build_indexes()
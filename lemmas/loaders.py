@@ -0,0 +1,93 @@
+"""Batch loading of the lemmas referenced by dicts and terms."""
+from bson import DBRef
+from promise import Promise
+from promise.dataloader import DataLoader
+
+from .models import Lemma
+
+CONNECTION_ARGS = frozenset(("first", "last", "before", "after"))
+"""The arguments of a connection field that are not filters."""
+
+
+class LemmaLoader(DataLoader):
+    """Load all the lemmas a response refers to with a single query."""
+
+    def batch_load_fn(self, ids):
+        lemmas = {lemma.pk: lemma for lemma in Lemma.objects(pk__in=ids)}
+        return Promise.resolve([lemmas.get(pk) for pk in ids])
+
+
+def get_lemma_loader(context):
+    """Get the lemma loader of a request, making it on first use.
+
+    A loader caches the lemmas it has loaded, so it must only live as long
+    as the request it belongs to.
+    """
+    if context is None:
+        return LemmaLoader()
+
+    if not hasattr(context, "lemma_loader"):
+        context.lemma_loader = LemmaLoader()
+
+    return context.lemma_loader
+
+
+def load_lemma(info, reference):
+    """Load a lemma, given the raw value of a ReferenceField.
+
+    Args:
+        info: the graphql resolve info of the request
+        reference: a Lemma, or a DBRef or ObjectId pointing at one
+
+    Returns:
+        Promise: resolves to the Lemma, None if it does not exist
+    """
+    if reference is None or isinstance(reference, Lemma):
+        return Promise.resolve(reference)
+
+    pk = reference.id if isinstance(reference, DBRef) else reference
+    return get_lemma_loader(info.context).load(pk)
+
+
+def load_lemmas(info, references):
+    """Load the lemmas of the raw value of a ListField(ReferenceField(Lemma)).
+
+    Returns:
+        Promise: resolves to a list of the existing Lemmas
+    """
+    return Promise.all(
+        [load_lemma(info, reference) for reference in references or []]
+    ).then(lambda lemmas: [lemma for lemma in lemmas if lemma is not None])
+
+
+def filter_lemmas(lemmas, filters):
+    """Keep the lemmas whose fields have the values given in filters."""
+    return [
+        lemma
+        for lemma in lemmas
+        if all(getattr(lemma, field) == value for field, value in filters.items())
+    ]
+
+
+def load_filtered_lemmas(info, references, args):
+    """Load the lemmas of a connection field, applying its filter arguments.
+
+    Args:
+        info: the graphql resolve info of the request
+        references: the raw value of a ListField(ReferenceField(Lemma))
+        args: the arguments the field was queried with
+
+    Returns:
+        Promise: resolves to the list of wanted Lemmas. None if args has
+            filters that are not plain Lemma fields, like a global id, so
+            that graphene-mongo falls back to its queryset resolver.
+    """
+    filters = {
+        name: value for name, value in args.items() if name not in CONNECTION_ARGS
+    }
+    if any(name == "id" or name not in Lemma._fields for name in filters):
+        return None
+
+    return load_lemmas(info, references).then(
+        lambda lemmas: filter_lemmas(lemmas, filters)
+    )
@@ -0,0 +1,95 @@
+import unittest
+from types import SimpleNamespace
+
+from bson import DBRef, ObjectId
+from promise import Promise
+
+from lemmas.loaders import (
+    LemmaLoader,
+    get_lemma_loader,
+    load_filtered_lemmas,
+    load_lemma,
+    load_lemmas,
+)
+from lemmas.models import Lemma
+
+
+class RecordingLoader(LemmaLoader):
+    """Load lemmas from a dict, recording the batches asked for."""
+
+    def __init__(self, lemmas):
+        super().__init__()
+        self.lemmas = lemmas
+        self.batches = []
+
+    def batch_load_fn(self, ids):
+        self.batches.append(list(ids))
+        return Promise.resolve([self.lemmas.get(pk) for pk in ids])
+
+
+class TestLemmaLoader(unittest.TestCase):
+    def setUp(self):
+        self.lemmas = {
+            pk: Lemma(pk=pk, lemma=lemma, presentation_lemma=lemma, language="sme")
+            for pk, lemma in ((ObjectId(), "guolli"), (ObjectId(), "guolástit"))
+        }
+        self.loader = RecordingLoader(self.lemmas)
+        self.info = SimpleNamespace(context=SimpleNamespace(lemma_loader=self.loader))
+
+    def test_loader_is_per_context(self):
+        context = SimpleNamespace()
+        self.assertIs(get_lemma_loader(context), get_lemma_loader(context))
+        self.assertIsNot(get_lemma_loader(context), get_lemma_loader(SimpleNamespace()))
+
+    def test_references_are_loaded_in_one_batch(self):
+        first, second = self.lemmas
+
+        def resolve(_):
+            # graphql runs resolvers as promise jobs, like this one
+            return Promise.all(
+                [
+                    load_lemmas(self.info, [DBRef("lemmas", first), second]),
+                    load_lemma(self.info, DBRef("lemmas", second)),
+                ]
+            )
+
+        results = Promise.resolve(None).then(resolve).get()
+
+        self.assertEqual(
+            results,
+            [[self.lemmas[first], self.lemmas[second]], self.lemmas[second]],
+        )
+        self.assertEqual(self.loader.batches, [[first, second]])
+
+    def test_loaded_lemmas_are_used_as_is(self):
+        lemma = next(iter(self.lemmas.values()))
+
+        self.assertIs(load_lemma(self.info, lemma).get(), lemma)
+        self.assertEqual(self.loader.batches, [])
+
+    def test_missing_lemmas_are_dropped(self):
+        first = next(iter(self.lemmas))
+
+        self.assertEqual(
+            load_lemmas(self.info, [ObjectId(), first]).get(), [self.lemmas[first]]
+        )
+
+    def test_filters_are_applied_to_loaded_lemmas(self):
+        references = list(self.lemmas)
+        args = {"first": 10, "language": "sme", "lemma": "guolli"}
+
+        self.assertEqual(
+            [
+                lemma.lemma
+                for lemma in load_filtered_lemmas(self.info, references, args).get()
+            ],
+            ["guolli"],
+        )
+        self.assertEqual(
+            load_filtered_lemmas(self.info, references, {"language": "fin"}).get(), []
+        )
+
+    def test_other_filters_fall_back_to_the_queryset(self):
+        self.assertIsNone(
+            load_filtered_lemmas(self.info, list(self.lemmas), {"id": "TGVtbWE6MQ=="})
+        )
@@ -1,29 +1,90 @@
 """Lemmatise incoming words"""
 import re
 import sys
+import time
 from collections import namedtuple
 from pathlib import Path
 
 import hfst
 
+try:
+    from .transducers import CachedTransducer
+except ImportError:
+    # Run as a script, from this directory
+    from transducers import CachedTransducer
+
 ATTS = re.compile(r"@[^@]+@")
 
 Classification = namedtuple("Classification", "regex classification")
 Analysis = namedtuple("Analysis", "analysis weight")
+Lemmatised = namedtuple("Lemmatised", "wordforms analyses")
+
+
+def get_characters(transducer):
+    """Find the single characters in the alphabet of a transducer.
+
+    Multicharacter symbols, like tags and flag diacritics, are left out.
+    """
+    return frozenset(symbol for symbol in transducer.get_alphabet() if len(symbol) == 1)
+
+
+def lemmatise_words(lemmatisers, words, deadline):
+    """Lemmatise words with each of lemmatisers, until deadline has passed.
+
+    The hfst bindings never release the GIL, so threads could not look up
+    in parallel, and the lookups are done one after the other, each word in
+    all the languages before the next word. Worker processes are what runs
+    requests in parallel; a process pool per request would spend more on
+    sending the words and analyses between processes than the lookups of
+    a typical query take. A lookup that has started is finished, so
+    deadline may be passed by one lookup.
+
+    Args:
+        lemmatisers: Lemmatisers by language
+        words: the words to lemmatise
+        deadline: a time.monotonic() value
+
+    Returns:
+        dict: lists with the Lemmatised of each word by language, None for
+            the words that were not lemmatised before deadline
+    """
+    results = {lang: [None] * len(words) for lang in lemmatisers}
+    for position, word in enumerate(words):
+        for lang, lemmatiser in lemmatisers.items():
+            if time.monotonic() > deadline:
+                return results
+            results[lang][position] = lemmatiser.lemmatise_and_analyse(word)
+
+    return results
 
 
 class Lemmatiser:
     """Given a wordform and a language, spit out possible wordforms."""
 
-    def __init__(self, lang):
-        """Initialise HFST analysers."""
+    def __init__(self, lang, make_cache=None, on_lookup=None):
+        """Initialise HFST analysers.
+
+        Args:
+            lang: the language of the analysers
+            make_cache: makes the cache of an analyser from its name, like
+                lemmatiser-analyser-sme, None looks up without caching
+            on_lookup: called with lang for each lookup in an analyser
+        """
         path = Path("/usr/share/giella") / lang
-        self.analyser = hfst.HfstInputStream(
-            str(path / "analyser-gt-desc.hfstol")
-        ).read()
-        self.generator = hfst.HfstInputStream(
-            str(path / "generator-gt-norm.hfstol")
-        ).read()
+        self.language = lang
+        self.analyser = CachedTransducer(
+            hfst.HfstInputStream(str(path / "analyser-gt-desc.hfstol")).read(),
+            lang,
+            make_cache(f"lemmatiser-analyser-{lang}") if make_cache else None,
+            on_lookup,
+        )
+        self.generator = CachedTransducer(
+            hfst.HfstInputStream(str(path / "generator-gt-norm.hfstol")).read(),
+            lang,
+            make_cache(f"lemmatiser-generator-{lang}") if make_cache else None,
+            on_lookup,
+        )
+        self.alphabet = get_characters(self.analyser.transducer)
 
     def analyse(self, word):
         """Analyse word.
@@ -34,17 +95,43 @@ class Lemmatiser:
         Returns:
             list: a list of hfst analyses
         """
+        if not self.may_analyse(word):
+            return iter(())
+
         return (
             Analysis(ATTS.sub("", analysis[0]), analysis[1])
             for analysis in self.analyser.lookup(word)
             if "?" not in analysis[0] and "+Err" not in analysis[0]
         )
 
+    def may_analyse(self, word):
+        """Check if the analyser knows all the characters of word.
+
+        Words with other characters can not have any analyses, so they are
+        not looked up.
+        """
+        return set(word) <= self.alphabet
+
+    def lemmas(self, analyses):
+        """Find the lemmas of analyses."""
+        return sorted({analysis.analysis.split("+")[0] for analysis in analyses})
+
     def lemmatise(self, word):
         """Lemmatize word using a descriptive analyser."""
-        return sorted(
-            {analysis.analysis.split("+")[0] for analysis in self.analyse(word)}
-        )
+        return self.lemmas(self.analyse(word))
+
+    def lemmatise_and_analyse(self, word):
+        """Lemmatise word, keeping the analyses the lemmas are made from.
+
+        Args:
+            word: a word that should be lemmatised
+
+        Returns:
+            Lemmatised: the lemmas and the analyses of word, from a single
+                lookup in the analyser
+        """
+        analyses = list(self.analyse(word))
+        return Lemmatised(self.lemmas(analyses), analyses)
 
 
 class SmeLemmatiser(Lemmatiser):
@@ -200,20 +287,24 @@ class SmeLemmatiser(Lemmatiser):
             for generated in self.analysis_to_wordforms(f"{start}{classified_tags}")
         ]
 
-    def lemmatise(self, word):
-        """Lemmatize word using a descriptive analyser."""
+    def lemmas(self, analyses):
+        """Generate the lemmas of analyses."""
         return sorted(
             {
                 generated
-                for analysis in self.analyse(word)
+                for analysis in analyses
                 for generated in self.generate(analysis.analysis)
             }
         )
 
 
-def lemmatiser(language):
+def lemmatiser(language, make_cache=None, on_lookup=None):
     """Get a language specific lemmatiser."""
-    return Lemmatiser(language) if language != "sme" else SmeLemmatiser(language)
+    return (
+        Lemmatiser(language, make_cache, on_lookup)
+        if language != "sme"
+        else SmeLemmatiser(language, make_cache, on_lookup)
+    )
 
 
 if __name__ == "__main__":
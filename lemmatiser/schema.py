@@ -1,35 +1,127 @@
 """Setup a schema to get results from the lemmatiser."""
+import logging
+import time
 from pathlib import Path
 
 import graphene
+from django.conf import settings
 
-from .lemmatiser import lemmatiser
-from .types import LemmatiserResultType
+from backend.instrumentation import record_fst_lookup
+from backend.transducers import fst_cache
+
+from .lemmatiser import lemmatise_words, lemmatiser
+from .tokens import get_words
+from .types import LemmatisedTextType, LemmatiserResultType
 
 LEMMATISERS = {
-    path.name: lemmatiser(path.name) for path in Path("/usr/share/giella/").glob("???")
+    path.name: lemmatiser(path.name, fst_cache, record_fst_lookup)
+    for path in Path("/usr/share/giella/").glob("???")
 }
 
+LOGGER = logging.getLogger(__name__)
+
+
+def get_languages(languages):
+    """Find the languages to lemmatise in, all of them if languages is None."""
+    if languages is None:
+        return list(LEMMATISERS)
+
+    return [lang for lang in LEMMATISERS if lang in languages]
+
+
+def lemmatise_all(words, languages):
+    """Lemmatise words in each of languages, for at most LEMMATISER_TIMEOUT seconds.
+
+    Returns:
+        dict: lists with the Lemmatised of each word by language, None for
+            the words that were not lemmatised in time
+    """
+    results = lemmatise_words(
+        {lang: LEMMATISERS[lang] for lang in languages},
+        words,
+        time.monotonic() + settings.LEMMATISER_TIMEOUT,
+    )
+    timed_out = [lang for lang, lemmatised in results.items() if None in lemmatised]
+    if timed_out:
+        LOGGER.warning(
+            f"lemmatising {len(words)} words timed out in {', '.join(timed_out)}"
+        )
+
+    return results
+
+
+def to_result(language, lemmatised):
+    """Make a LemmatiserResultType out of the Lemmatised of a language.
+
+    A word that was not lemmatised in time, with lemmatised None, gets an
+    empty result marked as timed out.
+    """
+    if lemmatised is None:
+        return {
+            "language": language,
+            "wordforms": [],
+            "analyses": [],
+            "timed_out": True,
+        }
+
+    return {
+        "language": language,
+        "wordforms": lemmatised.wordforms,
+        "analyses": [
+            {"analysis": analysis.analysis, "weight": analysis.weight}
+            for analysis in lemmatised.analyses
+        ],
+        "timed_out": False,
+    }
+
 
 class Query(graphene.ObjectType):
     """Query class for lemmatiser."""
 
     lemmatised = graphene.List(
-        LemmatiserResultType, lookup_string=graphene.String(required=True)
+        LemmatiserResultType,
+        lookup_string=graphene.String(required=True),
+        languages=graphene.List(graphene.String),
     )
 
-    def resolve_lemmatised(self, info, lookup_string=None):
-        """Lemmatise lookup_string."""
+    lemmatised_text = graphene.Field(
+        LemmatisedTextType,
+        text=graphene.String(required=True),
+        languages=graphene.List(graphene.String),
+    )
+
+    def resolve_lemmatised(self, info, lookup_string=None, languages=None):
+        """Lemmatise lookup_string, in all languages unless languages is given."""
         return [
-            {
-                "language": lang,
-                "wordforms": [
-                    wordform for wordform in LEMMATISERS[lang].lemmatise(lookup_string)
-                ],
-                "analyses": [
-                    {"analysis": analysis.analysis, "weight": analysis.weight}
-                    for analysis in LEMMATISERS[lang].analyse(lookup_string)
-                ],
-            }
-            for lang in LEMMATISERS
+            to_result(lang, lemmatised[0])
+            for lang, lemmatised in lemmatise_all(
+                [lookup_string], get_languages(languages)
+            ).items()
         ]
+
+    def resolve_lemmatised_text(self, info, text, languages=None):
+        """Lemmatise each different word of text once."""
+        tokens, words = get_words(
+            text,
+            settings.LEMMATISED_TEXT_MAX_LENGTH,
+            settings.LEMMATISED_TEXT_MAX_WORDS,
+        )
+        positions = {word: position for position, word in enumerate(words)}
+        by_language = lemmatise_all(words, get_languages(languages))
+
+        return {
+            "tokens": [{"token": token, "word": positions[token]} for token in tokens],
+            "words": [
+                {
+                    "word": word,
+                    "results": [
+                        to_result(lang, lemmatised[position])
+                        for lang, lemmatised in by_language.items()
+                    ],
+                }
+                for position, word in enumerate(words)
+            ],
+            "timed_out_languages": [
+                lang for lang, lemmatised in by_language.items() if None in lemmatised
+            ],
+        }
@@ -1,5 +1,6 @@
 """Test the lemmatiser engine."""
 import unittest
+from unittest import mock
 
 from nose2.tools import params
 
@@ -99,3 +100,53 @@ class TestLemmatiser(unittest.TestCase):
     def test_lemmatiser(self, language, word, exptected_results):
         """Test that the lemmatiser return expected values."""
         assert self.lemmatisers[language].lemmatise(word) == sorted(exptected_results)
+
+    @params(("sme", "biillat"), ("sme", "vuolgimat"), ("sme", "viđaid"))
+    def test_lemmatise_and_analyse(self, language, word):
+        """Test that one lookup gives the same as lemmatise and analyse."""
+        lemmatised = self.lemmatisers[language].lemmatise_and_analyse(word)
+
+        assert lemmatised.wordforms == self.lemmatisers[language].lemmatise(word)
+        assert lemmatised.analyses == list(self.lemmatisers[language].analyse(word))
+
+    @params(("sme", "biillat", True), ("sme", "viđaid", True), ("sme", "漢字", False))
+    def test_may_analyse(self, language, word, expected):
+        """Test that words with unknown characters are not looked up."""
+        assert self.lemmatisers[language].may_analyse(word) == expected
+
+
+class FakeLemmatiser:
+    """Lemmatise words to themselves, taking a second each."""
+
+    def __init__(self, clock):
+        self.clock = clock
+
+    def lemmatise_and_analyse(self, word):
+        self.clock.append(self.clock[-1] + 1)
+        return lemmatiser.Lemmatised([word], [])
+
+
+class TestLemmatiseWords(unittest.TestCase):
+    """Test lemmatising words in many languages before a deadline."""
+
+    def setUp(self):
+        self.clock = [0]
+        self.lemmatisers = {lang: FakeLemmatiser(self.clock) for lang in ["sme", "fin"]}
+
+    def lemmatise_words(self, words, deadline):
+        with mock.patch("time.monotonic", lambda: self.clock[-1]):
+            return lemmatiser.lemmatise_words(self.lemmatisers, words, deadline)
+
+    def test_all_words_in_time(self):
+        results = self.lemmatise_words(["guolli", "bivdu"], 10)
+
+        assert results["fin"][1] == lemmatiser.Lemmatised(["bivdu"], [])
+        assert all(all(lemmatised) for lemmatised in results.values())
+
+    def test_words_left_at_deadline_are_none(self):
+        results = self.lemmatise_words(["guolli", "bivdu"], 2)
+
+        assert results["sme"][0] == lemmatiser.Lemmatised(["guolli"], [])
+        assert results["fin"][0] == lemmatiser.Lemmatised(["guolli"], [])
+        assert results["sme"][1] == lemmatiser.Lemmatised(["bivdu"], [])
+        assert results["fin"][1] is None
@@ -0,0 +1,31 @@
+"""Test the tokeniser."""
+import unittest
+
+from nose2.tools import params
+
+from lemmatiser.tokens import get_words, tokenise
+
+
+class TestTokenise(unittest.TestCase):
+    """Check that texts are split into words."""
+
+    @params(
+        ("Mus lea biila.", ["Mus", "lea", "biila"]),
+        ("Ø:i ja www:s", ["Ø:i", "ja", "www:s"]),
+        ("sámi-norgga sátnegirji", ["sámi-norgga", "sátnegirji"]),
+        ("«čáppat», čáppat!", ["čáppat", "čáppat"]),
+        ("  ", []),
+    )
+    def test_tokenise(self, text, expected):
+        assert tokenise(text) == expected
+
+    def test_get_words(self):
+        assert get_words("Mus lea biila, dus lea biila.", 100, 4) == (
+            ["Mus", "lea", "biila", "dus", "lea", "biila"],
+            ["Mus", "lea", "biila", "dus"],
+        )
+
+    @params(("Mus lea biila, dus lea biila.", 10, 4), ("Mus lea biila.", 100, 2))
+    def test_get_words_is_capped(self, text, max_length, max_words):
+        with self.assertRaises(ValueError):
+            get_words(text, max_length, max_words)
@@ -0,0 +1,41 @@
+import unittest
+from unittest import mock
+
+from backend.cache import LRUCache
+from lemmatiser.transducers import CachedTransducer
+
+
+class TestCachedTransducer(unittest.TestCase):
+    def setUp(self):
+        self.transducer = mock.Mock()
+        self.transducer.lookup.return_value = [["guolli+N+Sg+Nom", 0.0]]
+        self.on_lookup = mock.Mock()
+        self.cached = CachedTransducer(
+            self.transducer,
+            "sme",
+            LRUCache("test-analyser-sme", maxsize=2),
+            self.on_lookup,
+        )
+
+    def test_repeated_lookups_skip_the_transducer(self):
+        results = [self.cached.lookup("guolli") for _ in range(3)]
+
+        self.assertEqual(results[0], (("guolli+N+Sg+Nom", 0.0),))
+        self.assertTrue(all(result is results[0] for result in results))
+        self.transducer.lookup.assert_called_once_with("guolli")
+        self.on_lookup.assert_called_once_with("sme")
+        self.assertEqual(self.cached.cache.stats()["hits"], 2)
+
+    def test_size_is_bounded(self):
+        for word in ("guolli", "guoli", "guolit"):
+            self.cached.lookup(word)
+
+        self.assertEqual(len(self.cached.cache), 2)
+        self.assertEqual(self.cached.cache.stats()["evictions"], 1)
+
+    def test_turned_off(self):
+        cached = CachedTransducer(self.transducer, "sme")
+        cached.lookup("guolli")
+        cached.lookup("guolli")
+
+        self.assertEqual(self.transducer.lookup.call_count, 2)
@@ -0,0 +1,44 @@
+"""Split texts into the words to lemmatise."""
+import re
+
+TOKEN_RE = re.compile(r"\w+(?:[-:'’]\w+)*")
+"""Words, keeping inner hyphens, colons and apostrophes like in Ø:i."""
+
+
+def tokenise(text):
+    """Find the words of text, in the order they appear.
+
+    Args:
+        text: a sentence or paragraph
+
+    Returns:
+        list: the words of text, without punctuation and whitespace
+    """
+    return TOKEN_RE.findall(text)
+
+
+def get_words(text, max_length, max_words):
+    """Tokenise text and find its different words.
+
+    Args:
+        text: a sentence or paragraph
+        max_length: max number of characters in text
+        max_words: max number of different words in text
+
+    Raises:
+        ValueError: if text is longer than max_length, or has more than
+            max_words different words
+
+    Returns:
+        tuple: the tokens of text and its different words, in the order
+            they appear
+    """
+    if len(text) > max_length:
+        raise ValueError(f"The text is longer than {max_length} characters")
+
+    tokens = tokenise(text)
+    words = list(dict.fromkeys(tokens))
+    if len(words) > max_words:
+        raise ValueError(f"The text has more than {max_words} different words")
+
+    return tokens, words
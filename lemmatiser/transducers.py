@@ -0,0 +1,40 @@
+"""Lookups in hfst transducers, memoised per transducer.
+
+This module does not import django or the backend, so that the lemmatiser
+still runs as a script. The caches and lookup counts of the backend are
+passed in instead.
+"""
+
+
+class CachedTransducer:
+    """Look up strings in a transducer, remembering the latest results.
+
+    Args:
+        transducer: an hfst transducer
+        language: the language of the transducer
+        cache: anything with a get_or_compute(key, compute) method, like
+            backend.cache.LRUCache, None turns the cache off
+        on_lookup: called with language for each lookup in the transducer
+    """
+
+    def __init__(self, transducer, language, cache=None, on_lookup=None):
+        self.transducer = transducer
+        self.language = language
+        self.cache = cache
+        self.on_lookup = on_lookup
+
+    def lookup(self, string):
+        """Look up string.
+
+        Returns:
+            tuple: (output, weight) tuples, as given by the transducer
+        """
+        if self.cache is None:
+            return self.uncached_lookup(string)
+
+        return self.cache.get_or_compute(string, lambda: self.uncached_lookup(string))
+
+    def uncached_lookup(self, string):
+        if self.on_lookup is not None:
+            self.on_lookup(self.language)
+        return tuple(tuple(result) for result in self.transducer.lookup(string))
@@ -15,3 +15,26 @@ class LemmatiserResultType(graphene.ObjectType):
     language = graphene.String(required=True)
     wordforms = graphene.List(graphene.String, required=True)
     analyses = graphene.List(LemmatiserAnalysis, required=True)
+    timed_out = graphene.Boolean(required=True)
+
+
+class LemmatisedWordType(graphene.ObjectType):
+    """The results of a word, for all languages."""
+
+    word = graphene.String(required=True)
+    results = graphene.List(LemmatiserResultType, required=True)
+
+
+class TokenType(graphene.ObjectType):
+    """A token of a text, and the position of its word in the word list."""
+
+    token = graphene.String(required=True)
+    word = graphene.Int(required=True)
+
+
+class LemmatisedTextType(graphene.ObjectType):
+    """The tokens of a text, and the results of each different word."""
+
+    tokens = graphene.List(TokenType, required=True)
+    words = graphene.List(LemmatisedWordType, required=True)
+    timed_out_languages = graphene.List(graphene.String, required=True)
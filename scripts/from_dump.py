@@ -4,12 +4,22 @@ import os
 import re
 import sys
 
+from django.conf import settings
 from lxml import etree
 from mongoengine.errors import ValidationError
 from termwikitools import dumphandler
 
+from backend.cache import dataset_version
 from dicts.models import DictEntry, ExampleGroup, Restriction, TranslationGroup
 from lemmas.models import Lemma
+from stems.bitmasks import DICT_BITS, LANGUAGE_BITS, dict_mask, language_mask
+from stems.completions import (
+    COMPLETION_FIELDS,
+    CompletionIndex,
+    completion_record,
+    completions_path,
+)
+from stems.keys import fold_key, search_key
 from stems.models import Stem
 from terms.models import Concept, Term
 
@@ -132,12 +142,15 @@ def get_valid_langs(termwiki_concept):
 
 def make_concepts(title, termwiki_concept, valid_langs):
     for lang in valid_langs:
+        terms = list(make_terms(lang, termwiki_concept))
         c = Concept(
             name=f"{title}",
             language=lang,
             definition=get_definition(lang, termwiki_concept),
             explanation=get_explanation(lang, termwiki_concept),
-            terms=make_terms(lang, termwiki_concept),
+            terms=terms,
+            expressions=[term.expression.lemma for term in terms],
+            expressionLanguage=LANGS[lang],
             collections=list(termwiki_concept.concept.collection)
             if termwiki_concept.concept is not None
             and termwiki_concept.concept.collection is not None
@@ -271,10 +284,10 @@ def make_translation_groups(translation_groups, target, dictprefix):
     ]
 
 
-def add_to_stems(lemma, dictname, src, target):
+def add_to_stems(lemma, dict_name, src, target):
     if "(+" not in lemma:
         stem = get_stem(lemma)
-        stem["dicts"].add(f"{dictname}{src}{target}")
+        stem["dicts"].add(dict_name)
         stem["fromlangs"].add(src)
         stem["tolangs"].add(target)
     else:
@@ -287,22 +300,34 @@ def add_dictentry_to_stems(dict_entry, dictprefix, src, target):
             sammallahti_replacer(lookup_lemma.lemma)
             if dictprefix == "sammallahti"
             else lookup_lemma.lemma,
-            dictprefix,
+            dict_entry.dictName,
             src,
             target,
         )
 
-    if dictprefix == "sammallahti":
+    # Reverse dicts are looked up from their translations with the languages
+    # swapped, so the translations are stems of the target language
+    if dict_entry.dictName in settings.REVERSE_DICTS:
         for translation_group in dict_entry.translationGroups:
             for translation_lemma in translation_group.translationLemmas:
                 add_to_stems(
-                    sammallahti_replacer(translation_lemma.lemma),
-                    dictprefix,
-                    src,
+                    sammallahti_replacer(translation_lemma.lemma)
+                    if dictprefix == "sammallahti"
+                    else translation_lemma.lemma,
+                    dict_entry.dictName,
                     target,
+                    src,
                 )
 
 
+def get_translation_lemma_strings(translation_groups):
+    return [
+        lemma.lemma
+        for translation_group in translation_groups
+        for lemma in translation_group.translationLemmas
+    ]
+
+
 def make_dict_entries(dictxml, dictprefix, src, target):
     for entry in dictxml.iter("e"):
         if (
@@ -314,12 +339,17 @@ def make_dict_entries(dictxml, dictprefix, src, target):
                 entry.xpath(".//tg"), target, dictprefix
             )
             if translation_groups:
+                lookup_lemmas = make_lemmas(entry.xpath(".//l"), src, dictprefix)
                 dict_entry = DictEntry(
                     dictName=f"{dictprefix}{src}{target}",
                     srcLang=src,
                     targetLang=target,
-                    lookupLemmas=make_lemmas(entry.xpath(".//l"), src, dictprefix),
+                    lookupLemmas=lookup_lemmas,
                     translationGroups=translation_groups,
+                    lookupLemmaStrings=[lemma.lemma for lemma in lookup_lemmas],
+                    translationLemmaStrings=get_translation_lemma_strings(
+                        translation_groups
+                    ),
                 )
                 try:
                     dict_entry.save()
@@ -434,15 +464,33 @@ def import_sms():
                     add_dictentry_to_stems(dict_entry, dictprefix, "sms", lang)
 
 
+def report_unregistered(stem, names, bits):
+    unregistered = sorted(set(names) - set(bits))
+    if unregistered:
+        print(f"{stem}: {', '.join(unregistered)} missing from stems.bitmasks")
+
+
 def make_stems():
     for stem in STEMS:
+        report_unregistered(
+            stem, STEMS[stem]["fromlangs"] | STEMS[stem]["tolangs"], LANGUAGE_BITS
+        )
+        report_unregistered(stem, STEMS[stem]["dicts"], DICT_BITS)
+        search_stem = search_key(stem)
+        fold_stem = fold_key(stem)
         try:
             s = Stem(
                 stem=stem,
-                search_stem=stem.lower(),
+                search_stem=search_stem,
+                reversed_search_stem=search_stem[::-1],
+                fold_stem=fold_stem,
+                reversed_fold_stem=fold_stem[::-1],
                 srclangs=list(STEMS[stem]["fromlangs"]),
                 targetlangs=list(STEMS[stem]["tolangs"]),
                 dicts=list(STEMS[stem]["dicts"]),
+                srclangs_mask=language_mask(STEMS[stem]["fromlangs"]),
+                targetlangs_mask=language_mask(STEMS[stem]["tolangs"]),
+                dicts_mask=dict_mask(STEMS[stem]["dicts"]),
             )
             s.save()
         except ValidationError as error:
@@ -450,6 +498,15 @@ def make_stems():
             print(stem)
 
 
+def write_completions():
+    path = completions_path(settings.STEM_COMPLETIONS_DIR, dataset_version())
+    print(f"Writing stem completions to {path}")
+    CompletionIndex(
+        completion_record(row)
+        for row in Stem.objects.only(*COMPLETION_FIELDS).as_pymongo()
+    ).dump(path)
+
+
 def run():
     import_sammallahti()
     import_dicts()
@@ -457,3 +514,4 @@ def run():
     import_smjmed()
     import_sms()
     make_stems()
+    write_completions()
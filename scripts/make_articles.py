@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Precompute the articles served when ARTICLE_SNAPSHOTS is turned on.
+
+Run this after from_dump, as articles are only served for the dataset
+they were made from.
+"""
+from itertools import islice
+
+from mongoengine.context_managers import switch_collection
+
+from articles.models import Article
+from articles.snapshots import make_articles
+from dicts.models import DictEntry
+from lemmas.models import Lemma
+from terms.models import Concept
+
+BATCH_SIZE = 1000
+BUILD_COLLECTION = "articles_build"
+
+
+def run():
+    print("Making article snapshots")
+    lemmas = {lemma["_id"]: lemma for lemma in Lemma.objects.as_pymongo()}
+    articles = iter(
+        make_articles(
+            DictEntry.objects.as_pymongo(), Concept.objects.as_pymongo(), lemmas
+        )
+    )
+
+    # The articles are built in a separate collection, which only replaces
+    # the served one once all of them are written.
+    with switch_collection(Article, BUILD_COLLECTION) as BuildArticle:
+        BuildArticle.drop_collection()
+        BuildArticle.ensure_indexes()
+        while True:
+            batch = list(islice(articles, BATCH_SIZE))
+            if not batch:
+                break
+            BuildArticle.objects.insert(batch, load_bulk=False)
+
+        BuildArticle._get_collection().rename(
+            Article._get_collection_name(), dropTarget=True
+        )
+
+    print(f"{Article.objects.count()} articles")
@@ -0,0 +1,79 @@
+"""Encode the languages and dictionaries of stems as bitmasks.
+
+The position of a name in LANGUAGES or DICTS is its bit in the masks stored
+in the database, so new names must only be appended to the registries.
+"""
+
+LANGUAGES = (
+    "eng",
+    "fin",
+    "lat",
+    "nno",
+    "nob",
+    "rus",
+    "sma",
+    "sme",
+    "smj",
+    "smn",
+    "sms",
+    "swe",
+)
+
+DICTS = (
+    "termwiki",
+    "sammallahtismefin",
+    "gtfinnob",
+    "gtfinsme",
+    "gtfinsmn",
+    "gtnobsma",
+    "gtnobsme",
+    "gtsmanob",
+    "gtsmasme",
+    "gtsmefin",
+    "gtsmenob",
+    "gtsmesma",
+    "gtsmesmn",
+    "gtsmnfin",
+    "gtsmnsme",
+    "gtsmesmj",
+    "gtsmjnob",
+    "gtsmjsme",
+    "habmersmjnob",
+    "habmernobsmj",
+    "gtfinsms",
+    "gtnobsms",
+    "gtrussms",
+    "gtsmsfin",
+    "gtsmsnob",
+    "gtsmsrus",
+)
+
+LANGUAGE_BITS = {language: 1 << bit for bit, language in enumerate(LANGUAGES)}
+DICT_BITS = {dictname: 1 << bit for bit, dictname in enumerate(DICTS)}
+
+
+def to_mask(names, bits):
+    """Encode names as a bitmask, skipping names that are not registered.
+
+    Args:
+        names: an iterable of language or dictionary names
+        bits: LANGUAGE_BITS or DICT_BITS
+
+    Returns:
+        int: the bitwise or of the bits of the registered names
+    """
+    mask = 0
+    for name in names:
+        mask |= bits.get(name, 0)
+
+    return mask
+
+
+def language_mask(languages):
+    """Encode languages as a bitmask."""
+    return to_mask(languages, LANGUAGE_BITS)
+
+
+def dict_mask(dictnames):
+    """Encode dictionary names as a bitmask."""
+    return to_mask(dictnames, DICT_BITS)
@@ -0,0 +1,139 @@
+"""A compact index of stems for typeahead completion."""
+import json
+import os
+from array import array
+from bisect import bisect_left
+
+from .keys import prefix_successor, search_key
+
+COMPLETION_FIELDS = (
+    "stem",
+    "search_stem",
+    "srclangs_mask",
+    "targetlangs_mask",
+    "dicts_mask",
+)
+"""The Stem fields making up the records of the completion index."""
+
+BLOCK_SIZE = 64
+"""Number of consecutive stems sharing a set of block masks."""
+
+
+def completions_path(directory, version):
+    """Name the file holding the completion records of a dataset version."""
+    return os.path.join(directory, f"completions-{version}.json")
+
+
+def completion_record(row):
+    """Make a completion record of a raw stems collection document."""
+    return (
+        row["stem"],
+        row["search_stem"],
+        row.get("srclangs_mask", 0),
+        row.get("targetlangs_mask", 0),
+        row.get("dicts_mask", 0),
+    )
+
+
+def is_wanted(stem_masks, wanted_masks):
+    """Check that each of the stem masks shares a bit with the wanted mask."""
+    return all(
+        stem_mask & wanted_mask
+        for stem_mask, wanted_mask in zip(stem_masks, wanted_masks)
+    )
+
+
+class CompletionIndex:
+    """Complete prefixes to stems, in search_stem order.
+
+    The search keys are kept sorted, so the stems starting with a prefix are
+    a range found by binary search. The masks are kept in arrays, and the
+    stems are divided into blocks of BLOCK_SIZE, whose masks are the bitwise
+    or of the masks of their stems, so blocks without wanted stems can be
+    skipped.
+
+    Args:
+        records: an iterable of (stem, search_stem, srclangs_mask,
+            targetlangs_mask, dicts_mask) tuples
+    """
+
+    def __init__(self, records):
+        self.keys = []
+        self.stems = []
+        self.masks = tuple(array("Q") for _ in range(3))
+        self.block_masks = tuple(array("Q") for _ in range(3))
+        for position, (stem, search_stem, *masks) in enumerate(
+            sorted(records, key=lambda record: (record[1], record[0]))
+        ):
+            self.keys.append(search_stem)
+            # Most stems are their own search key, so share the string
+            self.stems.append(search_stem if stem == search_stem else stem)
+            if position % BLOCK_SIZE == 0:
+                for block_masks in self.block_masks:
+                    block_masks.append(0)
+            for stem_masks, block_masks, mask in zip(
+                self.masks, self.block_masks, masks
+            ):
+                stem_masks.append(mask)
+                block_masks[-1] |= mask
+
+    def __len__(self):
+        return len(self.keys)
+
+    def find(self, prefix):
+        """Find the range of positions of the keys starting with prefix."""
+        if not prefix:
+            return 0, len(self.keys)
+
+        start = bisect_left(self.keys, prefix)
+        return start, bisect_left(self.keys, prefix_successor(prefix), lo=start)
+
+    def get_masks(self, masks, position):
+        return tuple(stem_masks[position] for stem_masks in masks)
+
+    def complete(self, prefix, k, src_mask, target_mask, dicts_mask):
+        """Find the first k wanted stems starting with prefix.
+
+        Args:
+            prefix: the string the user has typed so far
+            k: max number of completions
+            src_mask: bitmask of the wanted source languages
+            target_mask: bitmask of the wanted target languages
+            dicts_mask: bitmask of the wanted dictionaries
+
+        Returns:
+            list: the completed stems, sorted by search_stem
+        """
+        wanted_masks = (src_mask, target_mask, dicts_mask)
+        position, end = self.find(search_key(prefix))
+        completions = []
+        while position < end and len(completions) < k:
+            block = position // BLOCK_SIZE
+            block_end = min((block + 1) * BLOCK_SIZE, end)
+            if is_wanted(self.get_masks(self.block_masks, block), wanted_masks):
+                completions.extend(
+                    self.stems[stem_position]
+                    for stem_position in range(position, block_end)
+                    if is_wanted(
+                        self.get_masks(self.masks, stem_position), wanted_masks
+                    )
+                )
+            position = block_end
+
+        return completions[:k]
+
+    def records(self):
+        """Iterate over the records of the index, in search_stem order."""
+        for position, (stem, search_stem) in enumerate(zip(self.stems, self.keys)):
+            yield (stem, search_stem, *self.get_masks(self.masks, position))
+
+    def dump(self, path):
+        """Write the records of the index as json."""
+        with open(path, "w") as json_stream:
+            json.dump(list(self.records()), json_stream, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        """Make an index from records written by dump."""
+        with open(path) as json_stream:
+            return cls(json.load(json_stream))
@@ -0,0 +1,205 @@
+"""In-memory indexes of the read-only stems collection."""
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, namedtuple
+
+from .keys import fold_key, key_field, prefix_successor
+from .pagination import sort_key
+
+IndexedStem = namedtuple(
+    "IndexedStem",
+    "pk stem search_stem fold_stem srclangs_mask targetlangs_mask dicts_mask",
+)
+"""The fields of a stem the index searches and filters on."""
+
+INDEXED_FIELDS = IndexedStem._fields[1:]
+"""The Stem fields to read from mongodb, besides the id."""
+
+
+def indexed_stem(row):
+    """Make an IndexedStem of a raw stems collection document.
+
+    Reading raw documents, with as_pymongo, avoids making a Stem document
+    of every stem when the index is built.
+    """
+    return IndexedStem(
+        row["_id"],
+        row["stem"],
+        row["search_stem"],
+        row["fold_stem"],
+        row.get("srclangs_mask", 0),
+        row.get("targetlangs_mask", 0),
+        row.get("dicts_mask", 0),
+    )
+
+
+def trigrams(text):
+    """Find the character trigrams of text."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class SortedKeys:
+    """Keys sorted for prefix searches, pointing back at their stems.
+
+    Args:
+        keys: an iterable of search keys, in the order of the stems
+    """
+
+    def __init__(self, keys):
+        pairs = sorted((key, position) for position, key in enumerate(keys))
+        self.keys = [key for key, _ in pairs]
+        self.positions = array("I", (position for _, position in pairs))
+
+    def prefixed(self, prefix):
+        """Find the sorted stem positions of the keys starting with prefix."""
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix_successor(prefix), lo=start)
+        return sorted(self.positions[start:end])
+
+
+class StemIndex:
+    """Stems sorted by search_stem and id, searched with binary search.
+
+    Every search can be done either on search_stem, or on fold_stem to ignore
+    Sámi diacritics.
+
+    Args:
+        stems: an iterable of IndexedStems, or of objects with the same fields
+    """
+
+    def __init__(self, stems):
+        """Sort the stems and their keys once, so that searches are bisects."""
+        self.stems = sorted(stems, key=sort_key)
+        self.keys = {
+            "search_stem": [stem.search_stem for stem in self.stems],
+            "fold_stem": [stem.fold_stem for stem in self.stems],
+        }
+        self.prefixes = {name: SortedKeys(keys) for name, keys in self.keys.items()}
+        self.suffixes = {
+            name: SortedKeys(key[::-1] for key in keys)
+            for name, keys in self.keys.items()
+        }
+        self.postings = self.make_postings(self.keys["fold_stem"])
+
+    @staticmethod
+    def make_postings(keys):
+        """Map each trigram to the sorted positions of the keys containing it."""
+        postings = defaultdict(lambda: array("I"))
+        for position, key in enumerate(keys):
+            for trigram in trigrams(key):
+                postings[trigram].append(position)
+
+        return dict(postings)
+
+    def __len__(self):
+        return len(self.stems)
+
+    def start(self, after_key):
+        """Find the position of the first stem sorting after after_key.
+
+        Args:
+            after_key: the sort key of the last stem of the previous page, or
+                None to start from the first stem
+        """
+        if after_key is None:
+            return 0
+
+        search_stem, pk = after_key
+        keys = self.keys["search_stem"]
+        start = bisect_left(keys, search_stem)
+        end = bisect_right(keys, search_stem, lo=start)
+        # The few stems sharing search_stem are ordered by their ids
+        while start < end and self.stems[start].pk <= pk:
+            start += 1
+
+        return start
+
+    def following(self, positions, after_key):
+        """Pick the stems of the sorted positions that sort after after_key."""
+        start = bisect_left(positions, self.start(after_key))
+        return [self.stems[position] for position in positions[start:]]
+
+    def startswith(self, prefix, fold=False, after_key=None):
+        """Find the stems whose search key starts with prefix.
+
+        Args:
+            prefix: the string the user has typed so far
+            fold: whether to ignore Sámi diacritics
+            after_key: only find the stems sorting after this sort key
+
+        Returns:
+            list: the matching stems, sorted by search_stem and id
+        """
+        name, normalise = key_field(fold)
+        prefix = normalise(prefix)
+        if not prefix:
+            return self.stems[self.start(after_key) :]
+
+        return self.following(self.prefixes[name].prefixed(prefix), after_key)
+
+    def endswith(self, suffix, fold=False, after_key=None):
+        """Find the stems whose search key ends with suffix.
+
+        The suffix is reversed, turning the search into a prefix search among
+        the reversed keys.
+
+        Args:
+            suffix: the ending the user is looking for
+            fold: whether to ignore Sámi diacritics
+            after_key: only find the stems sorting after this sort key
+
+        Returns:
+            list: the matching stems, sorted by search_stem and id
+        """
+        name, normalise = key_field(fold)
+        reversed_suffix = normalise(suffix)[::-1]
+        if not reversed_suffix:
+            return self.stems[self.start(after_key) :]
+
+        return self.following(self.suffixes[name].prefixed(reversed_suffix), after_key)
+
+    def contains(self, substring, fold=False, after_key=None):
+        """Find the stems whose search key contains substring.
+
+        Substrings of three characters or more intersect the posting lists of
+        their trigrams, and only the remaining candidates are checked. The
+        trigrams are taken from fold_stem, as a stem containing substring also
+        does so when both are folded. Shorter substrings match most of the
+        stems, so the keys are scanned lazily, in sort order, and the scan
+        stops when the caller has taken enough hits.
+
+        Args:
+            substring: the string the user is looking for
+            fold: whether to ignore Sámi diacritics
+            after_key: only find the stems sorting after this sort key
+
+        Returns:
+            iterable: the matching stems, sorted by search_stem and id
+        """
+        name, normalise = key_field(fold)
+        substring = normalise(substring)
+        keys = self.keys[name]
+        substring_trigrams = trigrams(fold_key(substring))
+        if not substring_trigrams:
+            start = self.start(after_key)
+            return (
+                self.stems[position]
+                for position in range(start, len(keys))
+                if substring in keys[position]
+            )
+
+        posting_lists = sorted(
+            (self.postings.get(trigram, ()) for trigram in substring_trigrams),
+            key=len,
+        )
+        candidates = set(posting_lists[0])
+        for posting_list in posting_lists[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(posting_list)
+
+        return [
+            stem
+            for stem in self.following(sorted(candidates), after_key)
+            if substring in getattr(stem, name)
+        ]
@@ -0,0 +1,60 @@
+"""Normalised search keys of stems."""
+import unicodedata
+
+UNDECOMPOSABLE_LETTERS = str.maketrans(
+    {"đ": "d", "ŋ": "n", "ŧ": "t", "ǥ": "g", "ʒ": "z"}
+)
+"""Sámi letters that keep their diacritic after NFKD normalisation."""
+
+
+def search_key(text):
+    """Make a case insensitive search key.
+
+    Args:
+        text: a stem or a search string
+
+    Returns:
+        str: text casefolded and NFC normalised
+    """
+    return unicodedata.normalize("NFC", text.casefold())
+
+
+def fold_key(text):
+    """Make a case and diacritic insensitive search key.
+
+    Letters like č, á and ž are decomposed and stripped of their combining
+    marks, while letters like đ, ŋ and ŧ are replaced by their base letter,
+    so that words can be found without a Sámi keyboard.
+
+    Args:
+        text: a stem or a search string
+
+    Returns:
+        str: text casefolded, with the diacritics removed
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return unicodedata.normalize(
+        "NFC",
+        "".join(
+            character
+            for character in decomposed
+            if not unicodedata.combining(character)
+        ).translate(UNDECOMPOSABLE_LETTERS),
+    )
+
+
+def prefix_successor(prefix):
+    """Find the smallest string that sorts after all strings starting with prefix."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def key_field(fold):
+    """Choose the stem field to search, and how to normalise the search string.
+
+    Args:
+        fold: whether the search should ignore Sámi diacritics
+
+    Returns:
+        tuple: the name of the field and the key function for the search string
+    """
+    return ("fold_stem", fold_key) if fold else ("search_stem", search_key)
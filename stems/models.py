@@ -1,11 +1,48 @@
 from mongoengine import Document
-from mongoengine.fields import ListField, ObjectIdField, StringField
+from mongoengine.fields import IntField, ListField, ObjectIdField, StringField
+
+PAGE_INDEX = "search_stem_id_masks"
+"""The index stemList pages are read from, in (search_stem, id) order."""
 
 
 class Stem(Document):
-    meta = {"collection": "stems"}
+    meta = {
+        "collection": "stems",
+        "indexes": [
+            {
+                "fields": [
+                    "search_stem",
+                    "id",
+                    "srclangs_mask",
+                    "targetlangs_mask",
+                    "dicts_mask",
+                ],
+                "name": PAGE_INDEX,
+            },
+            (
+                "reversed_search_stem",
+                "srclangs_mask",
+                "targetlangs_mask",
+                "dicts_mask",
+            ),
+            ("fold_stem", "srclangs_mask", "targetlangs_mask", "dicts_mask"),
+            (
+                "reversed_fold_stem",
+                "srclangs_mask",
+                "targetlangs_mask",
+                "dicts_mask",
+            ),
+            ("stem", "targetlangs_mask", "dicts_mask"),
+        ],
+    }
     stem = StringField(required=True)
     search_stem = StringField(required=True)
+    reversed_search_stem = StringField()
+    fold_stem = StringField()
+    reversed_fold_stem = StringField()
     srclangs = ListField(StringField(required=True))
     targetlangs = ListField(StringField(required=True))
     dicts = ListField(StringField(required=True))
+    srclangs_mask = IntField(default=0)
+    targetlangs_mask = IntField(default=0)
+    dicts_mask = IntField(default=0)
@@ -0,0 +1,66 @@
+"""Keyset pagination of stems, ordered by (search_stem, id)."""
+import base64
+import json
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+TOTAL_COUNT_CAP = 1000
+"""Stop counting hits after this many, reporting the count as capped."""
+
+
+def sort_key(stem):
+    """Order stems by search_stem, breaking ties with the id."""
+    return (stem.search_stem, stem.pk)
+
+
+def encode_cursor(stem):
+    """Make an opaque cursor pointing at stem."""
+    return base64.b64encode(
+        json.dumps([stem.search_stem, str(stem.pk)]).encode("utf-8")
+    ).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """Turn a cursor made by encode_cursor back into a sort key.
+
+    Raises:
+        ValueError: if the cursor was not made by encode_cursor
+    """
+    try:
+        search_stem, pk = json.loads(base64.b64decode(cursor).decode("utf-8"))
+        return (search_stem, ObjectId(pk))
+    except (TypeError, ValueError, InvalidId) as error:
+        raise ValueError(f"Invalid cursor: {cursor}") from error
+
+
+class CappedCount:
+    """Count hits lazily, giving up after cap hits.
+
+    Args:
+        count_up_to: a callable counting hits, stopping at the given limit
+        cap: the highest count that is reported exactly
+    """
+
+    def __init__(self, count_up_to, cap=TOTAL_COUNT_CAP):
+        self.count_up_to = count_up_to
+        self.cap = cap
+        self._count = None
+
+    @property
+    def count(self):
+        """Count one hit past the cap, so that capped counts are detected."""
+        if self._count is None:
+            self._count = self.count_up_to(self.cap + 1)
+
+        return self._count
+
+    @property
+    def total(self):
+        """The number of hits, at most cap."""
+        return min(self.count, self.cap)
+
+    @property
+    def capped(self):
+        """Whether there are more hits than total."""
+        return self.count > self.cap
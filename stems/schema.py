@@ -1,24 +1,256 @@
 """Queries for stem models."""
 import logging
+import os
+from functools import lru_cache
+from itertools import islice
 
 import graphene
+from django.conf import settings
 from graphene_mongo.fields import MongoengineConnectionField
 from mongoengine.queryset.visitor import Q
 
-from .models import Stem
-from .types import StemType
+from backend.cache import LRUCache, dataset_version
+
+from .bitmasks import dict_mask, language_mask
+from .completions import (
+    COMPLETION_FIELDS,
+    CompletionIndex,
+    completion_record,
+    completions_path,
+)
+from .index import INDEXED_FIELDS, StemIndex, indexed_stem
+from .keys import key_field, prefix_successor
+from .models import PAGE_INDEX, Stem
+from .pagination import CappedCount, decode_cursor
+from .types import HasStemsType, StemType
 
 LOGGER = logging.getLogger(__name__)
 
+STEM_CACHE = LRUCache(
+    "stems", maxsize=settings.STEM_CACHE_SIZE, ttl=settings.STEM_CACHE_TTL or None
+)
+
+
+def get_cache_key(*args):
+    """Make a cache key of query arguments and the dataset version.
+
+    Lists are sorted, as the order of the wanted languages and dicts does
+    not change the result.
+    """
+    return tuple(
+        tuple(sorted(arg)) if isinstance(arg, list) else arg for arg in args
+    ) + (dataset_version(),)
+
+
+@lru_cache(maxsize=1)
+def get_stem_index():
+    """Get the in-memory stem index of this worker.
+
+    Gunicorn workers build it in the post_worker_init hook, before they take
+    any requests. Only the indexed fields are read, as raw documents.
+    """
+    return StemIndex(
+        indexed_stem(row) for row in Stem.objects.only(*INDEXED_FIELDS).as_pymongo()
+    )
+
+
+@lru_cache(maxsize=1)
+def get_completion_index(version):
+    """Get the completion index of a dataset version.
+
+    The index is read from the file from_dump wrote, if there is one, else it
+    is built from the raw documents of the stems collection.
+    """
+    path = completions_path(settings.STEM_COMPLETIONS_DIR, version)
+    if os.path.exists(path):
+        return CompletionIndex.load(path)
+
+    return CompletionIndex(
+        completion_record(row)
+        for row in Stem.objects.only(*COMPLETION_FIELDS).as_pymongo()
+    )
+
+
+def build_indexes():
+    """Build the in-memory indexes of this worker, before it takes requests.
+
+    The stem index is only built if it is turned on in settings. If mongodb
+    can not be read, the failure is logged and the worker boots anyway. The
+    indexes are then built on first use.
+    """
+    try:
+        if settings.STEM_INDEX:
+            get_stem_index()
+        get_completion_index(dataset_version())
+    except Exception:
+        LOGGER.exception("Could not build the in-memory indexes at startup")
+
+
+def get_prefix_filter(field, prefix):
+    """Keep stems whose field starts with prefix, as a range on its index."""
+    if not prefix:
+        return Q()
+
+    return Q(**{f"{field}__gte": prefix, f"{field}__lt": prefix_successor(prefix)})
+
+
+def get_search_filter(mode, search, fold=False):
+    """Keep stems matching search, comparing normalised keys."""
+    field, normalise = key_field(fold)
+    key = normalise(search)
 
-def get_search_filter(mode, search):
     if mode == "middle":
-        return Q(search_stem__icontains=search)
+        return Q(**{f"{field}__contains": key})
 
     if mode == "end":
-        return Q(search_stem__iendswith=search)
+        return get_prefix_filter(f"reversed_{field}", key[::-1])
+
+    return get_prefix_filter(field, key)
+
+
+def get_language_filter(src_langs, target_langs, wanted_dicts):
+    """Keep stems having at least one of the wanted languages and dicts."""
+    return Q(
+        __raw__={
+            "srclangs_mask": {"$bitsAnySet": language_mask(src_langs)},
+            "targetlangs_mask": {"$bitsAnySet": language_mask(target_langs)},
+            "dicts_mask": {"$bitsAnySet": dict_mask(wanted_dicts)},
+        }
+    )
+
+
+def get_target_filter(target_langs, wanted_dicts):
+    """Keep stems translated to one of the wanted languages in a wanted dict."""
+    return {
+        "targetlangs_mask": {"$bitsAnySet": language_mask(target_langs)},
+        "dicts_mask": {"$bitsAnySet": dict_mask(wanted_dicts)},
+    }
+
+
+def is_wanted(stem, src_mask, target_mask, dicts_mask):
+    """Check if an in-memory stem would pass the language filter."""
+    return (
+        stem.srclangs_mask & src_mask
+        and stem.targetlangs_mask & target_mask
+        and stem.dicts_mask & dicts_mask
+    )
+
+
+def get_indexed_stems(mode, search, fold, after_key=None):
+    """Find the stems matching search in the in-memory index."""
+    stem_index = get_stem_index()
+    if mode == "middle":
+        return stem_index.contains(search, fold=fold, after_key=after_key)
+
+    if mode == "end":
+        return stem_index.endswith(search, fold=fold, after_key=after_key)
+
+    return stem_index.startswith(search, fold=fold, after_key=after_key)
+
+
+def load_stems(indexed_stems):
+    """Fetch the Stem documents of a page of IndexedStems, in the same order."""
+    stems = Stem.objects.in_bulk([indexed.pk for indexed in indexed_stems])
+    return [stems[indexed.pk] for indexed in indexed_stems if indexed.pk in stems]
+
+
+def get_after_filter(after_key):
+    """Keep stems sorting after the last stem of the previous page."""
+    search_stem, pk = after_key
+    return Q(search_stem__gt=search_stem) | Q(search_stem=search_stem, id__gt=pk)
+
+
+def get_masks(src_langs, target_langs, wanted_dicts):
+    """Make the bitmasks of the wanted languages and dicts."""
+    return (
+        language_mask(src_langs),
+        language_mask(target_langs),
+        dict_mask(wanted_dicts),
+    )
 
-    return Q(search_stem__istartswith=search)
+
+def get_wanted_indexed_stems(mode, search, fold, masks, after_key=None):
+    """Find the wanted stems matching search in the in-memory index.
+
+    The hits are filtered by the masks as they are found, so short middle
+    searches only scan until the page, or the count, is full.
+    """
+    return (
+        stem
+        for stem in get_indexed_stems(mode, search, fold, after_key)
+        if is_wanted(stem, *masks)
+    )
+
+
+def get_stem_filter(mode, search, fold, src_langs, target_langs, wanted_dicts):
+    """Keep the wanted stems matching search."""
+    return get_search_filter(mode, search, fold) & get_language_filter(
+        src_langs, target_langs, wanted_dicts
+    )
+
+
+def get_stem_page(
+    mode, search, fold, src_langs, target_langs, wanted_dicts, first, after
+):
+    """Find a page of wanted stems matching search.
+
+    The stems are sorted by search_stem and id, and the page starts after the
+    stem the after cursor points at. Only first + 1 stems are fetched, the
+    extra stem tells whether there is a next page. If fold is set, Sámi
+    diacritics are ignored.
+
+    In mongodb the page is read in order from PAGE_INDEX, so there is no
+    sort of all the hits before the limit is applied. Searches on other keys
+    than search_stem are filtered while the index is walked.
+
+    Returns:
+        list: the stems of the page
+    """
+    after_key = None if after is None else decode_cursor(after)
+    limit = None if first is None else first + 1
+
+    if settings.STEM_INDEX:
+        masks = get_masks(src_langs, target_langs, wanted_dicts)
+        return load_stems(
+            list(
+                islice(
+                    get_wanted_indexed_stems(mode, search, fold, masks, after_key),
+                    limit,
+                )
+            )
+        )
+
+    search_filter = get_stem_filter(
+        mode, search, fold, src_langs, target_langs, wanted_dicts
+    )
+    page_filter = (
+        search_filter
+        if after_key is None
+        else search_filter & get_after_filter(after_key)
+    )
+    return list(
+        Stem.objects(page_filter)
+        .order_by("search_stem", "id")
+        .hint(PAGE_INDEX)
+        .limit(limit)
+    )
+
+
+def count_stems(mode, search, fold, src_langs, target_langs, wanted_dicts, cap):
+    """Count the wanted stems matching search, stopping at cap."""
+    if settings.STEM_INDEX:
+        masks = get_masks(src_langs, target_langs, wanted_dicts)
+        return sum(
+            1 for _ in islice(get_wanted_indexed_stems(mode, search, fold, masks), cap)
+        )
+
+    return (
+        Stem.objects(
+            get_stem_filter(mode, search, fold, src_langs, target_langs, wanted_dicts)
+        )
+        .limit(cap)
+        .count(with_limit_and_skip=True)
+    )
 
 
 class Query(graphene.ObjectType):
@@ -26,6 +258,7 @@ class Query(graphene.ObjectType):
         StemType,
         search=graphene.String(required=True),
         mode=graphene.String(required=True),
+        fold_diacritics=graphene.Boolean(default_value=False),
         src_langs=graphene.List(graphene.String, required=True),
         target_langs=graphene.List(graphene.String, required=True),
         wanted_dicts=graphene.List(graphene.String, required=True),
@@ -38,31 +271,92 @@ class Query(graphene.ObjectType):
         wanted_dicts=graphene.List(graphene.String, required=True),
     )
 
+    has_stems = graphene.List(
+        HasStemsType,
+        exacts=graphene.List(graphene.String, required=True),
+        src_langs=graphene.List(graphene.String, required=True),
+        target_langs=graphene.List(graphene.String, required=True),
+        wanted_dicts=graphene.List(graphene.String, required=True),
+    )
+
+    stem_completions = graphene.List(
+        graphene.String,
+        prefix=graphene.String(required=True),
+        k=graphene.Int(default_value=10),
+        src_langs=graphene.List(graphene.String, required=True),
+        target_langs=graphene.List(graphene.String, required=True),
+        wanted_dicts=graphene.List(graphene.String, required=True),
+    )
+
+    def resolve_stem_completions(self, info, prefix, k, **kwargs):
+        return get_completion_index(dataset_version()).complete(
+            prefix,
+            k,
+            language_mask(kwargs["src_langs"]),
+            language_mask(kwargs["target_langs"]),
+            dict_mask(kwargs["wanted_dicts"]),
+        )
+
     def resolve_has_stem(self, info, exact, **kwargs):
-        by_exact_stem = Stem.objects(stem=exact)
         target_langs = kwargs["target_langs"]
         wanted_dicts = kwargs["wanted_dicts"]
 
-        by_target_langs = [
-            s
-            for s in by_exact_stem
-            if any([targetlang in target_langs for targetlang in s.targetlangs])
-        ]
-        by_wanted_dicts = [
-            s
-            for s in by_target_langs
-            if any([dict in wanted_dicts for dict in s.dicts])
-        ]
+        return STEM_CACHE.get_or_compute(
+            get_cache_key("has_stem", exact, target_langs, wanted_dicts),
+            lambda: list(
+                Stem.objects(
+                    stem=exact, __raw__=get_target_filter(target_langs, wanted_dicts)
+                )
+            ),
+        )
 
-        return by_wanted_dicts
+    def resolve_has_stems(self, info, exacts, **kwargs):
+        """Check many words at once, sharing the cache entries of hasStem."""
+        target_langs = kwargs["target_langs"]
+        wanted_dicts = kwargs["wanted_dicts"]
+        cache_keys = {
+            exact: get_cache_key("has_stem", exact, target_langs, wanted_dicts)
+            for exact in exacts
+        }
+        by_exact = {
+            exact: STEM_CACHE.get(cache_key) for exact, cache_key in cache_keys.items()
+        }
+
+        uncached = [exact for exact, stems in by_exact.items() if stems is None]
+        if uncached:
+            for exact in uncached:
+                by_exact[exact] = []
+            for stem in Stem.objects(
+                stem__in=uncached,
+                __raw__=get_target_filter(target_langs, wanted_dicts),
+            ):
+                by_exact[stem.stem].append(stem)
+            for exact in uncached:
+                STEM_CACHE.put(cache_keys[exact], by_exact[exact])
+
+        return [
+            HasStemsType(
+                exact=exact, has_stem=bool(by_exact[exact]), stems=by_exact[exact]
+            )
+            for exact in exacts
+        ]
 
     def resolve_stem_list(self, info, search, **kwargs):
+        """Find a page of stems.
+
+        Only forward pagination, using first and after, is supported.
+        """
         src_langs = kwargs["src_langs"]
         target_langs = kwargs["target_langs"]
         wanted_dicts = kwargs["wanted_dicts"]
+        first = kwargs.get("first")
+        after = kwargs.get("after")
+        connection_type = StemType._meta.connection
 
         if not search:
-            return []
+            return connection_type.from_page(
+                [], first, CappedCount(lambda cap: 0), False
+            )
 
         log_info = [search]
         for key, value in kwargs.items():
@@ -73,23 +367,24 @@ class Query(graphene.ObjectType):
                 log_info.append(str(value))
         LOGGER.info(" ".join(log_info))
 
-        search_filter = get_search_filter(kwargs.get("mode"), search)
-
-        by_search_stem = Stem.objects(search_filter).order_by("search_stem")
-        by_src_langs = [
-            s
-            for s in by_search_stem
-            if any([srclang in src_langs for srclang in s.srclangs])
-        ]
-        by_target_langs = [
-            s
-            for s in by_src_langs
-            if any([targetlang in target_langs for targetlang in s.targetlangs])
-        ]
-        by_wanted_dicts = [
-            s
-            for s in by_target_langs
-            if any([dict in wanted_dicts for dict in s.dicts])
-        ]
+        search_args = (
+            kwargs.get("mode"),
+            search,
+            kwargs.get("fold_diacritics", False),
+            src_langs,
+            target_langs,
+            wanted_dicts,
+        )
+        stems = STEM_CACHE.get_or_compute(
+            get_cache_key("stem_list", *search_args, first, after),
+            lambda: get_stem_page(*search_args, first, after),
+        )
+        # The count is the same for all pages, so it is cached once per search
+        capped_count = CappedCount(
+            lambda cap: STEM_CACHE.get_or_compute(
+                get_cache_key("stem_count", *search_args, cap),
+                lambda: count_stems(*search_args, cap),
+            )
+        )
 
-        return by_wanted_dicts
+        return connection_type.from_page(stems, first, capped_count, after is not None)
@@ -0,0 +1,35 @@
+"""Test the bitmask encoding of languages and dictionaries."""
+import unittest
+
+from nose2.tools import params
+
+from stems.bitmasks import DICTS, LANGUAGES, dict_mask, language_mask
+
+
+class TestBitmasks(unittest.TestCase):
+    """Test the bitmask functions."""
+
+    @params(
+        ([], 0),
+        (["eng"], 1),
+        (["fin", "eng"], 3),
+        (["fin", "fin"], 2),
+        (["xyz"], 0),
+    )
+    def test_language_mask(self, languages, expected):
+        assert language_mask(languages) == expected
+
+    def test_all_dicts(self):
+        assert dict_mask(DICTS) == (1 << len(DICTS)) - 1
+
+    @params(
+        (["sme"], ["sme", "nob"], True),
+        (["sme", "fin"], ["nob"], False),
+        (["smj"], LANGUAGES, True),
+    )
+    def test_any_set(self, stem_languages, wanted, expected):
+        assert bool(language_mask(stem_languages) & language_mask(wanted)) == expected
+
+    def test_registries_are_unique(self):
+        assert len(set(LANGUAGES)) == len(LANGUAGES)
+        assert len(set(DICTS)) == len(DICTS)
@@ -0,0 +1,101 @@
+"""Test the completion index."""
+import os
+import tempfile
+import unittest
+
+from nose2.tools import params
+
+from stems.bitmasks import dict_mask, language_mask
+from stems.keys import search_key
+from stems.completions import BLOCK_SIZE, CompletionIndex, completion_record
+
+
+def make_record(stem, srclangs, targetlangs, dicts):
+    return (
+        stem,
+        search_key(stem),
+        language_mask(srclangs),
+        language_mask(targetlangs),
+        dict_mask(dicts),
+    )
+
+
+ALL = (
+    language_mask(["sme", "sma", "fin", "nob"]),
+    language_mask(["sme", "sma", "fin", "nob"]),
+    dict_mask(["gtsmenob", "gtsmanob", "termwiki"]),
+)
+
+
+class TestCompletionIndex(unittest.TestCase):
+    """Test the CompletionIndex class."""
+
+    def setUp(self):
+        self.index = CompletionIndex(
+            [
+                make_record("guolli", ["sme"], ["nob"], ["gtsmenob"]),
+                make_record("guollebivdu", ["sme"], ["nob"], ["gtsmenob"]),
+                make_record("Guovdageaidnu", ["sme"], ["fin"], ["termwiki"]),
+                make_record("guolle", ["sma"], ["nob"], ["gtsmanob"]),
+                make_record("gávpot", ["sme"], ["nob"], ["gtsmenob"]),
+            ]
+        )
+
+    @params(
+        ("guo", 10, ["guolle", "guollebivdu", "guolli", "Guovdageaidnu"]),
+        ("GUO", 2, ["guolle", "guollebivdu"]),
+        ("gá", 10, ["gávpot"]),
+        ("x", 10, []),
+        ("", 1, ["guolle"]),
+    )
+    def test_complete(self, prefix, k, expected):
+        assert self.index.complete(prefix, k, *ALL) == expected
+
+    def test_filters_languages(self):
+        assert self.index.complete(
+            "guo",
+            10,
+            language_mask(["sme"]),
+            language_mask(["nob"]),
+            dict_mask(["gtsmenob", "termwiki"]),
+        ) == ["guollebivdu", "guolli"]
+
+    def test_no_wanted_stems(self):
+        assert self.index.complete("guo", 10, language_mask(["smj"]), *ALL[1:]) == []
+
+    def test_dump_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "completions.json")
+            self.index.dump(path)
+            loaded = CompletionIndex.load(path)
+
+        assert loaded.complete("g", 10, *ALL) == self.index.complete("g", 10, *ALL)
+
+    def test_skips_unwanted_blocks(self):
+        records = [
+            make_record(f"guo{number:04}", ["sme"], ["nob"], ["gtsmenob"])
+            for number in range(3 * BLOCK_SIZE)
+        ] + [make_record("guovlu", ["sma"], ["nob"], ["gtsmanob"])]
+        index = CompletionIndex(records)
+
+        assert index.complete(
+            "guo",
+            10,
+            language_mask(["sma"]),
+            language_mask(["nob"]),
+            dict_mask(["gtsmanob"]),
+        ) == ["guovlu"]
+        assert index.complete("guo0", 2, *ALL) == ["guo0000", "guo0001"]
+
+    def test_records_are_sorted(self):
+        assert [record[0] for record in self.index.records()] == [
+            "guolle",
+            "guollebivdu",
+            "guolli",
+            "Guovdageaidnu",
+            "gávpot",
+        ]
+
+    def test_completion_record(self):
+        row = {"_id": 1, "stem": "Ávži", "search_stem": "ávži", "dicts_mask": 4}
+        assert completion_record(row) == ("Ávži", "ávži", 0, 0, 4)
@@ -0,0 +1,152 @@
+"""Test the in-memory stem indexes."""
+import unittest
+from collections import namedtuple
+
+from nose2.tools import params
+
+from stems.index import IndexedStem, StemIndex, indexed_stem, trigrams
+from stems.keys import fold_key, search_key
+from stems.pagination import sort_key
+
+FakeStem = namedtuple("FakeStem", "stem search_stem fold_stem pk")
+
+
+def make_stems(*stems):
+    return [
+        FakeStem(stem, search_key(stem), fold_key(stem), pk)
+        for pk, stem in enumerate(stems)
+    ]
+
+
+class TestStemIndex(unittest.TestCase):
+    """Test the StemIndex class."""
+
+    def setUp(self):
+        self.index = StemIndex(
+            make_stems(
+                "guolli",
+                "Argentina",
+                "arga",
+                "argat",
+                "ábmi",
+                "guoktá",
+                "gáldu",
+                "ar",
+            )
+        )
+
+    @params(
+        ("arg", ["arga", "argat", "Argentina"]),
+        ("ARG", ["arga", "argat", "Argentina"]),
+        ("guo", ["guoktá", "guolli"]),
+        ("gá", ["gáldu"]),
+        ("á", ["ábmi"]),
+        ("x", []),
+        ("argentinas", []),
+    )
+    def test_startswith(self, prefix, expected):
+        assert [stem.stem for stem in self.index.startswith(prefix)] == expected
+
+    @params(
+        ("a", ["arga", "Argentina"]),
+        ("Li", ["guolli"]),
+        ("ttá", []),
+        ("ktá", ["guoktá"]),
+        ("gáldu", ["gáldu"]),
+        ("q", []),
+    )
+    def test_endswith(self, suffix, expected):
+        assert [stem.stem for stem in self.index.endswith(suffix)] == expected
+
+    @params(
+        ("rg", ["arga", "argat", "Argentina"]),
+        ("uo", ["guoktá", "guolli"]),
+        ("rga", ["arga", "argat"]),
+        ("OKT", ["guoktá"]),
+        ("gentin", ["Argentina"]),
+        ("oll", ["guolli"]),
+        ("lol", []),
+        ("xyz", []),
+    )
+    def test_contains(self, substring, expected):
+        assert [stem.stem for stem in self.index.contains(substring)] == expected
+
+    def test_contains_short_search_is_lazy(self):
+        hits = self.index.contains("a")
+        assert next(hits).stem == "ar"
+        assert [stem.stem for stem in hits] == ["arga", "argat", "Argentina"]
+
+    def test_contains_short_search_finds_all_hits(self):
+        assert [stem.stem for stem in self.index.contains("a")] == [
+            "ar",
+            "arga",
+            "argat",
+            "Argentina",
+        ]
+
+    def test_contains_verifies_candidates(self):
+        index = StemIndex(make_stems("abcxbcd"))
+        assert index.contains("abcd") == []
+
+    def test_trigrams(self):
+        assert trigrams("guolli") == {"guo", "uol", "oll", "lli"}
+
+    @params(
+        ("startswith", "ab", ["ábmi"]),
+        ("startswith", "gal", ["gáldu"]),
+        ("endswith", "kta", ["guoktá"]),
+        ("contains", "okt", ["guoktá"]),
+        ("contains", "ld", ["gáldu"]),
+    )
+    def test_fold(self, method, search, expected):
+        stems = getattr(self.index, method)(search, fold=True)
+        assert [stem.stem for stem in stems] == expected
+
+    @params("startswith", "endswith", "contains")
+    def test_no_fold(self, method):
+        assert getattr(self.index, method)("gal") == []
+
+    @params(
+        ("startswith", "ruo"),
+        ("endswith", "a"),
+        ("contains", "uo"),
+        ("contains", "ruo"),
+    )
+    def test_after_key(self, method, search):
+        index = StemIndex(make_stems("ruossa", "Ruossa", "ruoná", "ruohtta"))
+        stems = list(getattr(index, method)(search))
+        for position, stem in enumerate(stems):
+            after = list(getattr(index, method)(search, after_key=sort_key(stem)))
+            assert after == stems[position + 1 :]
+
+    def test_sorted_by_search_stem(self):
+        keys = [stem.search_stem for stem in self.index.stems]
+        assert keys == sorted(keys)
+
+
+class TestIndexedStem(unittest.TestCase):
+    """Test making index rows of raw stem documents."""
+
+    def test_raw_document(self):
+        row = {
+            "_id": 1,
+            "stem": "Ávži",
+            "search_stem": "ávži",
+            "fold_stem": "avzi",
+            "dicts_mask": 4,
+        }
+        assert indexed_stem(row) == IndexedStem(1, "Ávži", "ávži", "avzi", 0, 0, 4)
+
+    def test_indexed_stems_are_searched(self):
+        index = StemIndex(
+            indexed_stem(
+                {
+                    "_id": pk,
+                    "stem": stem,
+                    "search_stem": search_key(stem),
+                    "fold_stem": fold_key(stem),
+                }
+            )
+            for pk, stem in enumerate(["guolli", "guoktá"])
+        )
+        assert [stem.pk for stem in index.startswith("guo")] == [1, 0]
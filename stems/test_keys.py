@@ -0,0 +1,35 @@
+"""Test the normalised search keys."""
+import unicodedata
+import unittest
+
+from nose2.tools import params
+
+from stems.keys import fold_key, prefix_successor, search_key
+
+
+class TestKeys(unittest.TestCase):
+    """Test the search key functions."""
+
+    @params(
+        ("Čáppat", "čáppat"),
+        (unicodedata.normalize("NFD", "Čáppat"), "čáppat"),
+        ("ŊUOLLA", "ŋuolla"),
+    )
+    def test_search_key(self, text, expected):
+        assert search_key(text) == expected
+
+    @params(
+        ("čáppat", "cappat"),
+        ("Đuoggá", "duogga"),
+        ("šaŋŋat", "sannat"),
+        ("ŧ", "t"),
+        ("žiehkká", "ziehkka"),
+        ("ǥǥʒ", "ggz"),
+        (unicodedata.normalize("NFD", "Čáppat"), "cappat"),
+    )
+    def test_fold_key(self, text, expected):
+        assert fold_key(text) == expected
+
+    @params(("a", "b"), ("arg", "arh"), ("gu", "gv"))
+    def test_prefix_successor(self, prefix, expected):
+        assert prefix_successor(prefix) == expected
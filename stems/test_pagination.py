@@ -0,0 +1,49 @@
+"""Test the keyset pagination of stems."""
+import unittest
+from collections import namedtuple
+
+from bson import ObjectId
+from nose2.tools import params
+
+from stems.pagination import (
+    CappedCount,
+    decode_cursor,
+    encode_cursor,
+    sort_key,
+)
+
+FakeStem = namedtuple("FakeStem", "stem search_stem pk")
+
+
+class TestCursors(unittest.TestCase):
+    """Test that cursors point at stems."""
+
+    def test_round_trip(self):
+        stem = FakeStem("Ávži", "ávži", ObjectId())
+        assert decode_cursor(encode_cursor(stem)) == sort_key(stem)
+
+    @params("YXJyYXljb25uZWN0aW9uOjk5", "not a cursor", "W10=")
+    def test_invalid_cursor(self, cursor):
+        with self.assertRaises(ValueError):
+            decode_cursor(cursor)
+
+
+class TestCappedCount(unittest.TestCase):
+    """Test the lazy, capped count."""
+
+    @params((5, 10, 5, False), (10, 10, 10, False), (11, 10, 10, True))
+    def test_count(self, hits, cap, total, capped):
+        capped_count = CappedCount(lambda limit: min(hits, limit), cap=cap)
+        assert capped_count.total == total
+        assert capped_count.capped == capped
+
+    def test_counts_once(self):
+        calls = []
+
+        def count_up_to(limit):
+            calls.append(limit)
+            return 3
+
+        capped_count = CappedCount(count_up_to)
+        assert (capped_count.total, capped_count.capped) == (3, False)
+        assert calls == [1001]
@@ -2,6 +2,7 @@ import graphene
 from graphene_mongo import MongoengineObjectType
 
 from .models import Stem
+from .pagination import encode_cursor
 
 
 class Connection(graphene.Connection):
@@ -9,9 +10,38 @@ class Connection(graphene.Connection):
         abstract = True
 
     total_count = graphene.Int()
+    total_count_capped = graphene.Boolean()
+
+    @classmethod
+    def from_page(cls, stems, first, capped_count, has_previous_page):
+        """Make a connection of a page of stems.
+
+        Args:
+            stems: the stems of the page, plus the first stem of the next page
+                if there is one
+            first: the page size, None if the page contains all stems
+            capped_count: a pagination.CappedCount of all stems
+            has_previous_page: whether the page is preceded by other pages
+        """
+        page = stems if first is None else stems[:first]
+        edges = [cls.Edge(node=stem, cursor=encode_cursor(stem)) for stem in page]
+        connection = cls(
+            edges=edges,
+            page_info=graphene.relay.PageInfo(
+                start_cursor=edges[0].cursor if edges else None,
+                end_cursor=edges[-1].cursor if edges else None,
+                has_previous_page=has_previous_page,
+                has_next_page=len(stems) > len(page),
+            ),
+        )
+        connection.capped_count = capped_count
+        return connection
 
     def resolve_total_count(self, info):
-        return len(self.iterable)
+        return self.capped_count.total
+
+    def resolve_total_count_capped(self, info):
+        return self.capped_count.capped
 
 
 class StemType(MongoengineObjectType):
@@ -19,3 +49,11 @@ class StemType(MongoengineObjectType):
         model = Stem
         interfaces = (graphene.relay.Node,)
         connection_class = Connection
+
+
+class HasStemsType(graphene.ObjectType):
+    """Whether a word is a stem, and the stems it matches."""
+
+    exact = graphene.String(required=True)
+    has_stem = graphene.Boolean(required=True)
+    stems = graphene.List(StemType, required=True)
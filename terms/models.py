@@ -19,13 +19,20 @@ class Term(EmbeddedDocument):
 
 
 class Concept(Document):
-    meta = {"collection": "terms"}
+    meta = {
+        "collection": "terms",
+        "indexes": ["expressions", ("name", "expressionLanguage")],
+    }
     name = StringField(required=True)
     language = StringField(required=True)
     definition = StringField(blank=True, null=True)
     explanation = StringField(blank=True, null=True)
     terms = ListField(EmbeddedDocumentField(Term), required=True)
     collections = ListField(StringField())
+    # The lemma strings of the term expressions, and their three letter
+    # language code.
+    expressions = ListField(StringField())
+    expressionLanguage = StringField()
 
     def __str__(self):
         return "%s: %s" % (self.name, self.language)
@@ -1,15 +1,67 @@
 import logging
+from collections import defaultdict
 
 import graphene
-from lemmas.models import Lemma
-from mongoengine.queryset.visitor import Q
+
+from articles.snapshots import get_articles, restore_concept, serves_articles
 
 from .models import Concept
-from .types import ConceptType
+from .types import ConceptsType, ConceptType
 
 LOGGER = logging.getLogger(__name__)
 
 
+def get_concept_pipeline(exacts, langs):
+    """Find the concepts having any of exacts as a term, in all wanted languages.
+
+    The names of the matching concepts are collected, with the exacts each
+    name is found by, then all language versions of those concepts are
+    looked up by name.
+    """
+    return [
+        {"$match": {"expressions": {"$in": exacts}}},
+        {"$unwind": "$expressions"},
+        {"$match": {"expressions": {"$in": exacts}}},
+        {"$group": {"_id": "$name", "exacts": {"$addToSet": "$expressions"}}},
+        {"$sort": {"_id": 1}},
+        {
+            "$lookup": {
+                "from": Concept._get_collection_name(),
+                "localField": "_id",
+                "foreignField": "name",
+                "as": "concepts",
+            }
+        },
+        {"$unwind": "$concepts"},
+        {"$match": {"concepts.expressionLanguage": {"$in": sorted(langs)}}},
+    ]
+
+
+def find_concepts(info, exacts, langs):
+    """Find the concepts of many lemmas at once.
+
+    Returns:
+        dict: lists of Concepts by exact
+    """
+    if serves_articles():
+        return {
+            exact: [
+                concept
+                for concept in map(restore_concept, article.concepts)
+                if concept.expressionLanguage in langs
+            ]
+            for exact, article in get_articles(info, exacts).items()
+        }
+
+    concepts = defaultdict(list)
+    for son in Concept.objects.aggregate(*get_concept_pipeline(exacts, langs)):
+        concept = Concept._from_son(son["concepts"])
+        for exact in son["exacts"]:
+            concepts[exact].append(concept)
+
+    return {exact: concepts[exact] for exact in exacts}
+
+
 class Query(graphene.ObjectType):
     concept_list = graphene.List(
         ConceptType,
@@ -18,33 +70,29 @@ class Query(graphene.ObjectType):
         target_langs=graphene.List(graphene.String, required=True),
     )
 
+    concepts = graphene.List(
+        ConceptsType,
+        exacts=graphene.List(graphene.String, required=True),
+        src_langs=graphene.List(graphene.String, required=True),
+        target_langs=graphene.List(graphene.String, required=True),
+    )
+
     def resolve_concept_list(self, info, exact, **kwargs):
         LOGGER.info(f"term: {exact}")
         src_langs = kwargs["src_langs"]
         target_langs = kwargs["target_langs"]
         langs = set(src_langs + target_langs)
-        names = [
-            concept.name
-            for concept in Concept.objects(
-                terms__expression__in=Lemma.objects(lemma=exact)
-            )
-        ]
-
-        LOGGER.info(f"names: {names}")
-        if not names:
-            return []
-
-        name_queries = [Q(name=name) for name in names]
-        name_filter = name_queries.pop()
-        for item in name_queries:
-            name_filter |= item
-
-        named = Concept.objects(name_filter)
-        wanted_by_langs = [
-            name for name in named if name.terms[0].expression.language in langs
-        ]
+        wanted_by_langs = find_concepts(info, [exact], langs)[exact]
 
         if wanted_by_langs:
             LOGGER.info(f"term: {exact} " f'langs: {", ".join(sorted(langs))}')
 
         return wanted_by_langs
+
+    def resolve_concepts(self, info, exacts, **kwargs):
+        """Find the concepts of many lemmas, grouped by lemma."""
+        by_exact = find_concepts(
+            info, exacts, set(kwargs["src_langs"] + kwargs["target_langs"])
+        )
+
+        return [ConceptsType(exact=exact, concepts=by_exact[exact]) for exact in exacts]
@@ -1,5 +1,8 @@
+import graphene
 from graphene_mongo import MongoengineObjectType
 
+from lemmas.loaders import load_lemma
+
 from .models import Concept, Term
 
 
@@ -7,7 +10,18 @@ class TermType(MongoengineObjectType):
     class Meta:
         model = Term
 
+    def resolve_expression(self, info):
+        # A ReferenceField becomes a field without arguments
+        return load_lemma(info, self._data.get("expression"))
+
 
 class ConceptType(MongoengineObjectType):
     class Meta:
         model = Concept
+
+
+class ConceptsType(graphene.ObjectType):
+    """The concepts found by a lemma."""
+
+    exact = graphene.String(required=True)
+    concepts = graphene.List(ConceptType, required=True)